@@ -5,10 +5,12 @@ Comprehensive validation system for floor plan generation
 Based on International Building Code (IBC) and best practices
 """
 
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 from shapely.geometry import Polygon, Point, LineString
 from shapely.ops import unary_union
+from shapely.strtree import STRtree
 import numpy as np
+import shapely
 import logging
 
 logger = logging.getLogger(__name__)
@@ -32,25 +34,34 @@ class ArchitecturalConstraintsValidator:
         """
         Comprehensive validation of complete floor plan.
         
+        Args:
+            units: List of unit dictionaries with polygon data
+            corridors: List of corridor polygons
+            core: Core polygon
+            boundary: Building boundary polygon
+        
         Returns:
             Dict with validation results and detailed violations
         """
         self.violations = []
         self.warnings = []
         
+        # Every unit's bounding box in one batch, for the dimension/depth checks
+        unit_bounds = shapely.bounds(np.array([u['polygon'] for u in units], dtype=object)).reshape(-1, 4)
+        
         # 1. Connectivity Constraints (Critical)
         self._validate_unit_corridor_connection(units, corridors)
         self._validate_corridor_core_connection(corridors, core)
         self._validate_dead_end_corridors(corridors, core)
         
         # 2. Spatial Constraints (Critical)
-        self._validate_unit_dimensions(units)
+        self._validate_unit_dimensions(units, unit_bounds)
         self._validate_corridor_widths(corridors)
         self._validate_core_size(core, len(units))
         
         # 3. Lighting & Ventilation (Critical)
         self._validate_external_facade(units, boundary)
-        self._validate_functional_depth(units, boundary)
+        self._validate_functional_depth(units, unit_bounds)
         
         # 4. Safety Constraints (Critical)
         self._validate_escape_distances(units, corridors, core)
@@ -85,14 +96,25 @@ class ArchitecturalConstraintsValidator:
         """
         corridor_union = unary_union(corridors) if corridors else None
         
-        for unit in units:
+        # Units touching at least one corridor, from one bulk index query
+        touching = set()
+        if corridor_union and units:
+            unit_idx, _ = STRtree(corridors).query(
+                np.array([u['polygon'] for u in units], dtype=object), predicate='intersects'
+            )
+            touching = set(unit_idx.tolist())
+        
+        for i, unit in enumerate(units):
             unit_polygon = unit['polygon']
             unit_id = unit['id']
             
             # Check if unit boundary touches corridor
             if corridor_union:
-                intersection = unit_polygon.boundary.intersection(corridor_union.boundary)
-                connection_length = intersection.length if hasattr(intersection, 'length') else 0
+                if i in touching:
+                    intersection = unit_polygon.boundary.intersection(corridor_union.boundary)
+                    connection_length = intersection.length if hasattr(intersection, 'length') else 0
+                else:
+                    connection_length = 0
                 
                 if connection_length < 0.9:  # Minimum door width
                     self.violations.append({
@@ -163,7 +185,7 @@ class ArchitecturalConstraintsValidator:
     # 2. SPATIAL CONSTRAINTS
     # ============================================================
     
-    def _validate_unit_dimensions(self, units: List[Dict]):
+    def _validate_unit_dimensions(self, units: List[Dict], unit_bounds: np.ndarray):
         """
         CRITICAL: Each unit must meet minimum dimensions for its type.
         """
@@ -174,11 +196,10 @@ class ArchitecturalConstraintsValidator:
             "3BR": {"width": 6.0, "depth": 7.0, "area": 85}
         }
         
-        for unit in units:
+        for unit, bounds in zip(units, unit_bounds.tolist()):
             unit_type = unit.get('type', 'Studio')
             unit_area = unit['area']
             unit_id = unit['id']
-            polygon = unit['polygon']
             
             # Get minimum requirements
             min_reqs = minimum_dimensions.get(unit_type, minimum_dimensions["Studio"])
@@ -194,7 +215,6 @@ class ArchitecturalConstraintsValidator:
                 })
             
             # Check dimensions (using bounding box as approximation)
-            bounds = polygon.bounds
             width = bounds[2] - bounds[0]
             depth = bounds[3] - bounds[1]
             min_dim = min(width, depth)
@@ -302,16 +322,14 @@ class ArchitecturalConstraintsValidator:
                     "unit_id": unit_id
                 })
     
-    def _validate_functional_depth(self, units: List[Dict], boundary: Polygon):
+    def _validate_functional_depth(self, units: List[Dict], unit_bounds: np.ndarray):
         """
         IMPORTANT: Units should not be too deep (poor natural light).
         """
-        for unit in units:
-            unit_polygon = unit['polygon']
+        for unit, bounds in zip(units, unit_bounds.tolist()):
             unit_id = unit['id']
             
             # Estimate depth from facade
-            bounds = unit_polygon.bounds
             width = bounds[2] - bounds[0]
             depth = bounds[3] - bounds[1]
             max_depth = max(width, depth)
@@ -396,13 +414,9 @@ class ArchitecturalConstraintsValidator:
         """
         PREFERRED: Check for privacy between units.
         """
-        # Simplified check - full implementation would check window positions
-        for i, unit1 in enumerate(units):
-            for unit2 in units[i+1:]:
-                distance = unit1['polygon'].distance(unit2['polygon'])
-                if distance == 0:  # Units share a wall
-                    # This is normal and expected, no violation
-                    pass
+        # Simplified check - full implementation would check window positions.
+        # Units sharing a wall is normal and expected, so nothing is flagged yet
+        pass
     
     # ============================================================
     # UTILITY FUNCTIONS
@@ -12,11 +12,59 @@ Supports multiple corridor patterns:
 
 from shapely.geometry import Polygon, box
 from shapely.ops import unary_union
-from typing import List, Tuple
+from shapely.prepared import prep
+from typing import List, Optional, Tuple
+import numpy as np
+import shapely
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Patterns whose corridors pass through the core centre by construction.
+# Only clipping to a usable area can disconnect them.
+_CORE_SAFE_PATTERNS = {"+", "L", "T", "line"}
+
+
+def _merge_axis_aligned_rects(rects: List[Polygon]) -> List[Polygon]:
+    """
+    Merge axis-aligned rectangles that are redundant.
+    
+    A rectangle is absorbed when it lies inside another, or when it shares
+    the other's full extent on one axis and overlaps/abuts it on the other
+    (the union is then itself a rectangle). The covered area is unchanged.
+    
+    Args:
+        rects: Axis-aligned rectangle polygons
+    
+    Returns:
+        Merged rectangle polygons
+    """
+    if len(rects) < 2:
+        return rects
+    
+    b = np.array([r.bounds for r in rects])
+    merged = False
+    while len(b) > 1:
+        x0, y0, x1, y1 = b[:, 0:1], b[:, 1:2], b[:, 2:3], b[:, 3:4]
+        # mergeable[i, j]: rect i can be folded into rect j
+        inside = (x0 >= x0.T) & (y0 >= y0.T) & (x1 <= x1.T) & (y1 <= y1.T)
+        same_row = np.isclose(y0, y0.T) & np.isclose(y1, y1.T) & (x0 <= x1.T) & (x0.T <= x1)
+        same_col = np.isclose(x0, x0.T) & np.isclose(x1, x1.T) & (y0 <= y1.T) & (y0.T <= y1)
+        mergeable = inside | same_row | same_col
+        np.fill_diagonal(mergeable, False)
+        pairs = np.argwhere(mergeable)
+        if not len(pairs):
+            break
+        i, j = pairs[0]
+        b[j, :2] = np.minimum(b[i, :2], b[j, :2])
+        b[j, 2:] = np.maximum(b[i, 2:], b[j, 2:])
+        b = np.delete(b, i, axis=0)
+        merged = True
+    
+    if not merged:
+        return rects
+    return [box(*row) for row in b]
+
 
 class CorridorPatternGenerator:
     """Generate different corridor patterns for floor plans."""
@@ -40,19 +88,26 @@ class CorridorPatternGenerator:
         self.width = self.maxx - self.minx
         self.height = self.maxy - self.miny
         self.area = boundary.area
+        # Rectangular boundary: bounds containment is exact containment
+        self._bbox_boundary = abs(self.width * self.height - self.area) <= 1e-9 * max(self.area, 1.0)
         
         # Core center
         self.core_center = core.centroid
         
-        logger.info(f"Corridor generator initialized: {self.width:.1f}m × {self.height:.1f}m")
+        logger.info("Corridor generator initialized: %.1fm × %.1fm", self.width, self.height)
     
-    def _ensure_core_connection(self, corridors: List[Polygon]) -> List[Polygon]:
+    def _ensure_core_connection(
+        self,
+        corridors: List[Polygon],
+        connected_mask: np.ndarray
+    ) -> List[Polygon]:
         """
         ✅ V2.4: Ensure ALL corridors connect to the core.
         Critical fix for isolated corridor problem.
         
         Args:
-            corridors: List of corridor polygons
+            corridors: List of corridor polygons (extended in place)
+            connected_mask: Boolean mask, True where the corridor touches the core buffer
         
         Returns:
             Enhanced corridors list with core connections guaranteed
@@ -60,25 +115,20 @@ class CorridorPatternGenerator:
         if not corridors:
             return corridors
         
-        # Buffer core slightly for connection detection
-        core_buffer = self.core.buffer(0.1)
-        
-        connected_corridors = []
-        unconnected_corridors = []
-        
-        # Classify corridors
-        for corridor in corridors:
-            if corridor.intersects(core_buffer):
-                connected_corridors.append(corridor)
-            else:
-                unconnected_corridors.append(corridor)
-        
         # If NO corridors connect to core, extend the closest one
-        if not connected_corridors and corridors:
+        if not connected_mask.any():
             logger.warning("⚠️ NO corridors connect to core! Extending closest corridor...")
             
             # Find closest corridor to core
-            closest_corridor = min(corridors, key=lambda c: c.distance(self.core))
+            closest_idx = min(range(len(corridors)), key=lambda i: corridors[i].distance(self.core))
+            closest_corridor = corridors[closest_idx]
+            
+            # Adjacent rectangular corridor: stretch it up to the core
+            extended = self._extend_to_core(closest_corridor)
+            if extended is not None:
+                corridors[closest_idx] = extended
+                logger.info("✅ Extended closest corridor to core")
+                return corridors
             
             # Create connector from corridor to core
             core_point = self.core.centroid
@@ -95,15 +145,17 @@ class CorridorPatternGenerator:
             logger.info("✅ Added connector to core")
         
         # Ensure main corridor network connects to core
-        elif connected_corridors:
-            corridor_network = unary_union(connected_corridors)
+        elif not connected_mask.all():
+            geoms = np.array(corridors, dtype=object)
+            corridor_network = unary_union(geoms[connected_mask])
+            network_buffer = prep(corridor_network.buffer(0.1))
+            network_point = corridor_network.centroid
             
             # Connect unconnected corridors to network
-            for uncorr in unconnected_corridors:
-                if not uncorr.intersects(corridor_network.buffer(0.1)):
+            for uncorr in geoms[~connected_mask]:
+                if not network_buffer.intersects(uncorr):
                     # Create connector
                     uncorr_point = uncorr.centroid
-                    network_point = corridor_network.centroid
                     
                     connector = self._create_connecting_corridor(
                         uncorr_point,
@@ -116,6 +168,41 @@ class CorridorPatternGenerator:
         
         return corridors
     
+    def _extend_to_core(self, corridor: Polygon) -> Optional[Polygon]:
+        """
+        Stretch an axis-aligned corridor so it reaches the core.
+        
+        Applies only when the corridor is a rectangle that overlaps the core
+        on one axis and sits within one corridor width of it on the other.
+        
+        Args:
+            corridor: Corridor polygon closest to the core
+        
+        Returns:
+            Extended corridor, or None if a separate connector is needed
+        """
+        x0, y0, x1, y1 = corridor.bounds
+        kx0, ky0, kx1, ky1 = self.core.bounds
+        w = self.corridor_width
+        
+        if abs((x1 - x0) * (y1 - y0) - corridor.area) > 1e-9 * max(corridor.area, 1.0):
+            return None
+        
+        if x0 < kx1 and kx0 < x1:
+            # Overlap in x: close the vertical gap
+            if 0 < ky0 - y1 <= w:
+                return box(x0, y0, x1, ky0)
+            if 0 < y0 - ky1 <= w:
+                return box(x0, ky1, x1, y1)
+        elif y0 < ky1 and ky0 < y1:
+            # Overlap in y: close the horizontal gap
+            if 0 < kx0 - x1 <= w:
+                return box(x0, y0, kx0, y1)
+            if 0 < x0 - kx1 <= w:
+                return box(kx1, y0, x1, y1)
+        
+        return None
+    
     def _create_connecting_corridor(self, point1, point2, width: float) -> Polygon:
         """
         Create a connecting corridor between two points.
@@ -152,7 +239,13 @@ class CorridorPatternGenerator:
                 max(y1, y2)
             )
         
-        # Clip to boundary
+        # Clip to boundary (bounds check first for rectangular boundaries)
+        if self._bbox_boundary:
+            cx0, cy0, cx1, cy1 = connector.bounds
+            if (cx0 >= self.minx and cy0 >= self.miny and
+                    cx1 <= self.maxx and cy1 <= self.maxy):
+                return connector
+        
         if self.boundary.contains(connector):
             return connector
         else:
@@ -174,54 +267,60 @@ class CorridorPatternGenerator:
         Returns:
             List of corridor polygons forming a grid
         """
+        w = self.corridor_width
+        minx, miny, maxx, maxy = self.minx, self.miny, self.maxx, self.maxy
+        W, H = self.width, self.height
+        boundary = self.boundary
+        
         if spacing is None:
             # Auto-calculate optimal spacing
             # Target: 10-12% corridor coverage (not 38%!)
             # Formula: fewer corridors, more space for units
-            spacing = min(self.width, self.height) / 2.5  # Reduced from 3.5
+            spacing = min(W, H) / 2.5  # Reduced from 3.5
             spacing = max(15.0, min(spacing, 30.0))  # Increased min from 10 to 15
         
-        logger.info(f"Creating grid pattern with {spacing:.1f}m spacing")
+        logger.info("Creating grid pattern with %.1fm spacing", spacing)
         
         corridors = []
         
         # Horizontal corridors (2-3 main corridors, not 5-6)
-        num_h_corridors = max(2, min(3, int(self.height / spacing)))
+        num_h_corridors = max(2, min(3, int(H / spacing)))
         for i in range(num_h_corridors):
             if num_h_corridors == 1:
-                y = self.miny + self.height / 2
+                y = miny + H / 2
             else:
-                y = self.miny + i * (self.height / (num_h_corridors - 1))
+                y = miny + i * (H / (num_h_corridors - 1))
             
             corridor = box(
-                self.minx,
-                y - self.corridor_width / 2,
-                self.maxx,
-                y + self.corridor_width / 2
+                minx,
+                y - w / 2,
+                maxx,
+                y + w / 2
             )
-            clipped = corridor.intersection(self.boundary)
+            clipped = corridor.intersection(boundary)
             if not clipped.is_empty and clipped.area > 1.0:
                 corridors.append(clipped)
         
         # Vertical corridors (2-3 main corridors, not 5-6)
-        num_v_corridors = max(2, min(3, int(self.width / spacing)))
+        num_v_corridors = max(2, min(3, int(W / spacing)))
         for i in range(num_v_corridors):
             if num_v_corridors == 1:
-                x = self.minx + self.width / 2
+                x = minx + W / 2
             else:
-                x = self.minx + i * (self.width / (num_v_corridors - 1))
+                x = minx + i * (W / (num_v_corridors - 1))
             
             corridor = box(
-                x - self.corridor_width / 2,
-                self.miny,
-                x + self.corridor_width / 2,
-                self.maxy
+                x - w / 2,
+                miny,
+                x + w / 2,
+                maxy
             )
-            clipped = corridor.intersection(self.boundary)
+            clipped = corridor.intersection(boundary)
             if not clipped.is_empty and clipped.area > 1.0:
                 corridors.append(clipped)
         
-        logger.info(f"Grid: {num_h_corridors} horizontal + {num_v_corridors} vertical = {len(corridors)} total")
+        logger.info("Grid: %d horizontal + %d vertical = %d total",
+                    num_h_corridors, num_v_corridors, len(corridors))
         
         return corridors
     
@@ -240,7 +339,7 @@ class CorridorPatternGenerator:
         
         aspect_ratio = self.width / self.height if self.height > 0 else 1.0
         
-        logger.info(f"Auto-selecting pattern: aspect={aspect_ratio:.2f}, area={self.area:.0f}m²")
+        logger.info("Auto-selecting pattern: aspect=%.2f, area=%.0fm²", aspect_ratio, self.area)
         
         # ✅ V2.5.1: Optimized decision logic
         # For large spaces, use H pattern (better than grid)
@@ -270,7 +369,7 @@ class CorridorPatternGenerator:
             List of corridor polygons
         """
         selected = self.select_pattern(pattern)
-        logger.info(f"Generating {selected}-pattern corridors")
+        logger.info("Generating %s-pattern corridors", selected)
         
         # Generate pattern
         if selected == "grid":  # ✅ V2.5.0: NEW Grid pattern
@@ -288,22 +387,33 @@ class CorridorPatternGenerator:
         else:  # T-pattern (default)
             corridors = self._create_T_pattern()
         
-        # Intersect with usable area if provided
+        # Intersect with usable area (if provided) and classify against the
+        # core in a single pass
+        check_core = bool(usable_area) or selected not in _CORE_SAFE_PATTERNS
+        core_buffer = self.core.buffer(0.1) if check_core else None
+        geoms = np.array(corridors, dtype=object)
         if usable_area:
-            clipped = []
-            for corridor in corridors:
-                clipped_corridor = corridor.intersection(usable_area)
-                if not clipped_corridor.is_empty:
-                    clipped.append(clipped_corridor)
-            corridors = clipped
-        
-        # ✅ V2.4: CRITICAL - Ensure core connection
-        corridors = self._ensure_core_connection(corridors)
+            geoms = shapely.intersection(geoms, usable_area)
+        areas = shapely.area(geoms)
+        keep = areas > 0.0
+        geoms, areas = geoms[keep], areas[keep]
+        kept = geoms.tolist()
+        if check_core:
+            shapely.prepare(core_buffer)
+            connected_mask = shapely.intersects(geoms, core_buffer)
+        
+        # ✅ V2.4: CRITICAL - Ensure core connection (patterns that are
+        # connected by construction skip the check)
+        if check_core:
+            corridors = self._ensure_core_connection(kept, connected_mask)
+        else:
+            corridors = kept
         
-        # Log results
-        total_area = sum(c.area for c in corridors)
-        ratio = total_area / self.area * 100 if self.area > 0 else 0
-        logger.info(f"Created {len(corridors)} corridors: {total_area:.1f}m² ({ratio:.1f}%)")
+        # Log results (connectors appended after `kept` have no cached area)
+        if logger.isEnabledFor(logging.INFO):
+            total_area = float(areas.sum()) + sum(c.area for c in corridors[len(areas):])
+            ratio = total_area / self.area * 100 if self.area > 0 else 0
+            logger.info("Created %d corridors: %.1fm² (%.1f%%)", len(corridors), total_area, ratio)
         
         return corridors
     
@@ -313,33 +423,35 @@ class CorridorPatternGenerator:
         Core typically at top center.
         """
         w = self.corridor_width
+        minx, miny, maxx = self.minx, self.miny, self.maxx
+        H = self.height
         corridors = []
         
         # Left vertical corridor (80% of height)
-        left_height = self.height * 0.8
+        left_height = H * 0.8
         left = box(
-            self.minx + w,
-            self.miny + self.height * 0.1,
-            self.minx + w * 2,
-            self.miny + self.height * 0.1 + left_height
+            minx + w,
+            miny + H * 0.1,
+            minx + w * 2,
+            miny + H * 0.1 + left_height
         )
         corridors.append(left)
         
         # Bottom horizontal corridor (full width)
         bottom = box(
-            self.minx + w,
-            self.miny + w,
-            self.maxx - w,
-            self.miny + w * 2
+            minx + w,
+            miny + w,
+            maxx - w,
+            miny + w * 2
         )
         corridors.append(bottom)
         
         # Right vertical corridor (80% of height)
         right = box(
-            self.maxx - w * 2,
-            self.miny + self.height * 0.1,
-            self.maxx - w,
-            self.miny + self.height * 0.1 + left_height
+            maxx - w * 2,
+            miny + H * 0.1,
+            maxx - w,
+            miny + H * 0.1 + left_height
         )
         corridors.append(right)
         
@@ -352,23 +464,24 @@ class CorridorPatternGenerator:
         Core at junction.
         """
         w = self.corridor_width
+        cx, cy = self.core_center.x, self.core_center.y
         corridors = []
         
         # Horizontal corridor (left to center)
         horiz = box(
             self.minx,
-            self.core_center.y - w / 2,
-            self.core_center.x + w,
-            self.core_center.y + w / 2
+            cy - w / 2,
+            cx + w,
+            cy + w / 2
         )
         corridors.append(horiz)
         
         # Vertical corridor (bottom to center)
         vert = box(
-            self.core_center.x - w / 2,
+            cx - w / 2,
             self.miny,
-            self.core_center.x + w / 2,
-            self.core_center.y + w
+            cx + w / 2,
+            cy + w
         )
         corridors.append(vert)
         
@@ -381,37 +494,41 @@ class CorridorPatternGenerator:
         Double-loaded with center connection.
         """
         w = self.corridor_width
+        minx, miny, maxx, maxy = self.minx, self.miny, self.maxx, self.maxy
+        cy = self.core_center.y
+        W = self.width
         corridors = []
         
         # Left vertical corridor
-        left_x = self.minx + self.width * 0.25
+        left_x = minx + W * 0.25
         left = box(
             left_x - w / 2,
-            self.miny + w,
+            miny + w,
             left_x + w / 2,
-            self.maxy - w
+            maxy - w
         )
         corridors.append(left)
         
         # Right vertical corridor
-        right_x = self.maxx - self.width * 0.25
+        right_x = maxx - W * 0.25
         right = box(
             right_x - w / 2,
-            self.miny + w,
+            miny + w,
             right_x + w / 2,
-            self.maxy - w
+            maxy - w
         )
         corridors.append(right)
         
         # Center horizontal connector
         center = box(
             left_x + w / 2,
-            self.core_center.y - w / 2,
+            cy - w / 2,
             right_x - w / 2,
-            self.core_center.y + w / 2
+            cy + w / 2
         )
         corridors.append(center)
         
+        corridors = _merge_axis_aligned_rects(corridors)
         logger.info("Created H-pattern: 2 parallel + 1 cross corridors")
         return corridors
     
@@ -421,44 +538,47 @@ class CorridorPatternGenerator:
         Core at center.
         """
         w = self.corridor_width
+        minx, miny, maxx, maxy = self.minx, self.miny, self.maxx, self.maxy
+        cx, cy = self.core_center.x, self.core_center.y
         corridors = []
         
         # North corridor
         north = box(
-            self.core_center.x - w / 2,
-            self.core_center.y + w / 2,
-            self.core_center.x + w / 2,
-            self.maxy - w
+            cx - w / 2,
+            cy + w / 2,
+            cx + w / 2,
+            maxy - w
         )
         corridors.append(north)
         
         # South corridor
         south = box(
-            self.core_center.x - w / 2,
-            self.miny + w,
-            self.core_center.x + w / 2,
-            self.core_center.y - w / 2
+            cx - w / 2,
+            miny + w,
+            cx + w / 2,
+            cy - w / 2
         )
         corridors.append(south)
         
         # East corridor
         east = box(
-            self.core_center.x + w / 2,
-            self.core_center.y - w / 2,
-            self.maxx - w,
-            self.core_center.y + w / 2
+            cx + w / 2,
+            cy - w / 2,
+            maxx - w,
+            cy + w / 2
         )
         corridors.append(east)
         
         # West corridor
         west = box(
-            self.minx + w,
-            self.core_center.y - w / 2,
-            self.core_center.x - w / 2,
-            self.core_center.y + w / 2
+            minx + w,
+            cy - w / 2,
+            cx - w / 2,
+            cy + w / 2
         )
         corridors.append(west)
         
+        corridors = _merge_axis_aligned_rects(corridors)
         logger.info("Created Plus-pattern: 4 directional corridors")
         return corridors
     
@@ -468,22 +588,23 @@ class CorridorPatternGenerator:
         Orientation based on building aspect ratio.
         """
         w = self.corridor_width
+        cx, cy = self.core_center.x, self.core_center.y
         corridors = []
         
         if self.width >= self.height:
             # Horizontal corridor
             corridor = box(
                 self.minx,
-                self.core_center.y - w / 2,
+                cy - w / 2,
                 self.maxx,
-                self.core_center.y + w / 2
+                cy + w / 2
             )
         else:
             # Vertical corridor
             corridor = box(
-                self.core_center.x - w / 2,
+                cx - w / 2,
                 self.miny,
-                self.core_center.x + w / 2,
+                cx + w / 2,
                 self.maxy
             )
         
@@ -497,48 +618,51 @@ class CorridorPatternGenerator:
         Current default pattern.
         """
         w = self.corridor_width
+        cx, cy = self.core_center.x, self.core_center.y
+        W, H = self.width, self.height
         corridors = []
         
-        if self.width >= self.height:
+        if W >= H:
             # Horizontal main + vertical branch
             # Main horizontal spine
             main = box(
                 self.minx,
-                self.core_center.y - w / 2,
+                cy - w / 2,
                 self.maxx,
-                self.core_center.y + w / 2
+                cy + w / 2
             )
             corridors.append(main)
             
             # Vertical branch (80% extension)
-            branch_length = self.height * 0.8 / 2
+            branch_length = H * 0.8 / 2
             branch = box(
-                self.core_center.x - w / 2,
-                self.core_center.y - branch_length,
-                self.core_center.x + w / 2,
-                self.core_center.y + branch_length
+                cx - w / 2,
+                cy - branch_length,
+                cx + w / 2,
+                cy + branch_length
             )
             corridors.append(branch)
         else:
             # Vertical main + horizontal branch
             # Main vertical spine
             main = box(
-                self.core_center.x - w / 2,
+                cx - w / 2,
                 self.miny,
-                self.core_center.x + w / 2,
+                cx + w / 2,
                 self.maxy
             )
             corridors.append(main)
             
             # Horizontal branch (80% extension)
-            branch_length = self.width * 0.8 / 2
+            branch_length = W * 0.8 / 2
             branch = box(
-                self.core_center.x - branch_length,
-                self.core_center.y - w / 2,
-                self.core_center.x + branch_length,
-                self.core_center.y + w / 2
+                cx - branch_length,
+                cy - w / 2,
+                cx + branch_length,
+                cy + w / 2
             )
             corridors.append(branch)
         
+        corridors = _merge_axis_aligned_rects(corridors)
         logger.info("Created T-pattern: Main spine + branch")
         return corridors
@@ -5,12 +5,75 @@ Exports generated floor plans to DXF with organized layers.
 
 import ezdxf
 from ezdxf.enums import TextEntityAlignment
-from shapely.geometry import Polygon, Point
-from typing import List, Dict
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
+from typing import List, Dict, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+_ANSI31 = None
+
+
+def _ansi31_pattern():
+    """ANSI31 hatch pattern definition, loaded once per process."""
+    global _ANSI31
+    if _ANSI31 is None:
+        from ezdxf.tools import pattern
+        _ANSI31 = pattern.load()["ANSI31"]
+    return _ANSI31
+
+
+def _exterior_coords(polygons: List[Polygon]) -> List[np.ndarray]:
+    """Exterior ring coordinates of each polygon, extracted in one batch call."""
+    if len(polygons) == 0:
+        return []
+    rings = shapely.get_exterior_ring(np.asarray(polygons, dtype=object))
+    coords, index = shapely.get_coordinates(rings, return_index=True)
+    counts = np.bincount(index, minlength=len(rings))
+    return np.split(coords, np.cumsum(counts)[:-1])
+
+
+def _coords(polygon: Polygon) -> np.ndarray:
+    """Exterior ring coordinates of a polygon as an (N, 2) array."""
+    return shapely.get_coordinates(polygon.exterior)
+
+
+def _offset_rectilinear(xy: np.ndarray, distance: float):
+    """
+    Outward offset of a closed axis-aligned ring with mitred corners.
+    
+    Args:
+        xy: Closed ring coordinates (first vertex repeated last)
+        distance: Offset distance in meters
+    
+    Returns:
+        Closed offset ring, or None if the ring is not rectilinear
+    """
+    d = np.diff(xy, axis=0)
+    length = np.hypot(d[:, 0], d[:, 1])
+    if len(d) < 4 or not (length > 0).all():
+        return None
+    if (np.minimum(np.abs(d[:, 0]), np.abs(d[:, 1])) > 1e-9).any():
+        return None
+    
+    # Unit outward normals (right-hand side of a counter-clockwise ring)
+    x, y = xy[:-1, 0], xy[:-1, 1]
+    signed_area = np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y)
+    n = np.column_stack([d[:, 1], -d[:, 0]]) / length[:, None]
+    if signed_area < 0:
+        n = -n
+    
+    # Mitre join between each vertex's incoming and outgoing edge: exact at
+    # right angles, a plain shift at collinear vertices
+    n_prev = np.roll(n, 1, axis=0)
+    dot = np.einsum('ij,ij->i', n, n_prev)
+    if (dot < -0.5).any():  # Zero-width spike
+        return None
+    out = xy[:-1] + (n + n_prev) * (distance / (1 + dot))[:, None]
+    return np.vstack([out, out[:1]])
+
 
 class DXFExporter:
     """Exports floor plans to DXF format with organized layers."""
@@ -28,29 +91,51 @@ class DXFExporter:
         "TEXT": {"color": 7},      # White
         "FURNITURE": {"color": 9}  # Light Gray
     }
+    _LAYER_COLORS = [(name, props["color"]) for name, props in LAYERS.items()]
+    
+    # Static entity attributes, shared by reference (ezdxf copies them)
+    _BOUNDARY_ATTRIBS = {'layer': 'BOUNDARY', 'closed': True}
+    _CORE_ATTRIBS = {'layer': 'CORE', 'closed': True}
+    _CORRIDOR_ATTRIBS = {'layer': 'CORRIDORS', 'closed': True}
+    _UNIT_ATTRIBS = {'layer': 'UNITS', 'closed': True}
+    _WALL_ATTRIBS = {'layer': 'WALLS', 'closed': True}
+    _DOOR_ATTRIBS = {'layer': 'DOORS'}  # Color comes from the layer
+    _DIMENSION_ATTRIBS = {'layer': 'DIMENSIONS'}
     
     def __init__(self):
         self.doc = None
         self.modelspace = None
+        # Unit exterior coordinates for the current drawing, by id(unit); the
+        # unit is kept alongside so its id cannot be reused while cached
+        self._unit_xy: Dict[int, Tuple[Dict, np.ndarray]] = {}
+    
+    def _unit_coords(self, units: List[Dict]) -> List[np.ndarray]:
+        """Exterior coordinates of each unit, extracted once per drawing."""
+        missing = [unit for unit in units if id(unit) not in self._unit_xy]
+        for unit, coords in zip(missing, _exterior_coords([unit["polygon"] for unit in missing])):
+            self._unit_xy[id(unit)] = (unit, coords)
+        return [self._unit_xy[id(unit)][1] for unit in units]
     
     def create_new_drawing(self) -> None:
         """Create a new DXF document."""
         self.doc = ezdxf.new('R2010')
         self.modelspace = self.doc.modelspace()
+        self._unit_xy = {}
         
         # Create layers
-        for layer_name, props in self.LAYERS.items():
-            self.doc.layers.add(layer_name, color=props["color"])
+        for layer_name, color in self._LAYER_COLORS:
+            self.doc.layers.add(layer_name, color=color)
         
         logger.info("Created new DXF document with standard layers")
     
     def add_boundary(self, boundary: Polygon) -> None:
         """Add boundary polygon to BOUNDARY layer."""
         try:
-            coords = list(boundary.exterior.coords)
+            coords = _coords(boundary)
             self.modelspace.add_lwpolyline(
                 coords,
-                dxfattribs={'layer': 'BOUNDARY', 'closed': True}
+                format='xy',
+                dxfattribs=self._BOUNDARY_ATTRIBS
             )
             logger.info("Added boundary to DXF")
         except Exception as e:
@@ -59,16 +144,17 @@ class DXFExporter:
     def add_core(self, core: Polygon) -> None:
         """Add core polygon to CORE layer."""
         try:
-            coords = list(core.exterior.coords)
+            coords = _coords(core)
             self.modelspace.add_lwpolyline(
                 coords,
-                dxfattribs={'layer': 'CORE', 'closed': True}
+                format='xy',
+                dxfattribs=self._CORE_ATTRIBS
             )
             
             # Add hatch pattern
             hatch = self.modelspace.add_hatch(color=6)
             hatch.paths.add_polyline_path(coords, is_closed=True)
-            hatch.set_pattern_fill("ANSI31", scale=0.5)
+            hatch.set_pattern_fill("ANSI31", scale=0.5, definition=_ansi31_pattern())
             hatch.dxf.layer = 'CORE'
             
             logger.info("Added core to DXF")
@@ -78,12 +164,10 @@ class DXFExporter:
     def add_corridors(self, corridors: List[Polygon]) -> None:
         """Add corridor polygons to CORRIDORS layer."""
         try:
-            for corridor in corridors:
-                coords = list(corridor.exterior.coords)
-                self.modelspace.add_lwpolyline(
-                    coords,
-                    dxfattribs={'layer': 'CORRIDORS', 'closed': True}
-                )
+            add_lwpolyline = self.modelspace.add_lwpolyline
+            dxfattribs = self._CORRIDOR_ATTRIBS
+            for coords in _exterior_coords(corridors):
+                add_lwpolyline(coords, format='xy', dxfattribs=dxfattribs)
             
             logger.info(f"Added {len(corridors)} corridors to DXF")
         except Exception as e:
@@ -92,21 +176,22 @@ class DXFExporter:
     def add_units(self, units: List[Dict]) -> None:
         """Add unit polygons to UNITS layer with labels."""
         try:
-            for unit in units:
-                polygon = unit["polygon"]
+            add_lwpolyline = self.modelspace.add_lwpolyline
+            dxfattribs = self._UNIT_ATTRIBS
+            
+            # Label positions for all units in one GEOS call
+            polygons = np.array([unit["polygon"] for unit in units], dtype=object)
+            centroids = shapely.get_coordinates(shapely.centroid(polygons))
+            
+            for unit, coords, (cx, cy) in zip(units, self._unit_coords(units), centroids):
                 unit_id = unit["id"]
                 unit_type = unit["type"]
                 area = unit["area"]
                 
                 # Add unit boundary
-                coords = list(polygon.exterior.coords)
-                self.modelspace.add_lwpolyline(
-                    coords,
-                    dxfattribs={'layer': 'UNITS', 'closed': True}
-                )
+                add_lwpolyline(coords, format='xy', dxfattribs=dxfattribs)
                 
                 # Add unit label at centroid
-                centroid = polygon.centroid
                 label_text = f"{unit_type}\n{area:.1f}m²"
                 
                 self.modelspace.add_mtext(
@@ -114,7 +199,7 @@ class DXFExporter:
                     dxfattribs={
                         'layer': 'TEXT',
                         'char_height': 1.5,
-                        'insert': (centroid.x, centroid.y),
+                        'insert': (cx, cy),
                         'attachment_point': 5  # Middle center
                     }
                 )
@@ -126,19 +211,25 @@ class DXFExporter:
     def add_walls(self, units: List[Dict], wall_thickness: float) -> None:
         """Add walls between units to WALLS layer."""
         try:
-            for unit in units:
-                polygon = unit["polygon"]
-                
-                # Create offset for wall thickness
-                outer = polygon.buffer(wall_thickness / 2)
-                inner = polygon.buffer(-wall_thickness / 2)
-                
-                # Add outer wall
-                coords = list(outer.exterior.coords)
-                self.modelspace.add_lwpolyline(
-                    coords,
-                    dxfattribs={'layer': 'WALLS', 'closed': True}
-                )
+            add_lwpolyline = self.modelspace.add_lwpolyline
+            dxfattribs = self._WALL_ATTRIBS
+            
+            # Offset rectilinear outlines edge by edge; anything else is
+            # buffered by GEOS in one vectorized call (16 segments per quarter
+            # circle, as polygon.buffer draws them)
+            offset = wall_thickness / 2
+            curved = []
+            for unit, coords in zip(units, self._unit_coords(units)):
+                outer = _offset_rectilinear(coords, offset)
+                if outer is None:
+                    curved.append(unit["polygon"])
+                else:
+                    add_lwpolyline(outer, format='xy', dxfattribs=dxfattribs)
+            
+            if curved:
+                outers = shapely.buffer(np.array(curved, dtype=object), offset, quad_segs=16)
+                for coords in _exterior_coords(outers):
+                    add_lwpolyline(coords, format='xy', dxfattribs=dxfattribs)
             
             logger.info(f"Added walls for {len(units)} units to DXF")
         except Exception as e:
@@ -155,59 +246,58 @@ class DXFExporter:
             door_width: Door width in meters
         """
         try:
-            from shapely.geometry import LineString
-            import numpy as np
-            
             doors_added = 0
             
-            for unit in units:
-                unit_poly = unit["polygon"]
+            unit_polys = np.array([unit["polygon"] for unit in units], dtype=object)
+            corridor_polys = np.array(corridors, dtype=object)
+            
+            # Spatial index over corridors: one bulk query yields every
+            # touching/intersecting (unit, corridor) pair
+            tree = shapely.STRtree(corridor_polys)
+            unit_idx, corridor_idx = tree.query(unit_polys, predicate='intersects')
+            
+            # Shared boundaries of all candidate pairs in one GEOS pass
+            intersections = shapely.intersection(
+                shapely.boundary(unit_polys)[unit_idx],
+                shapely.boundary(corridor_polys)[corridor_idx]
+            )
+            lengths = shapely.length(intersections)
+            wide_enough = lengths > door_width
+            unit_idx, corridor_idx = unit_idx[wide_enough], corridor_idx[wide_enough]
+            intersections, lengths = intersections[wide_enough], lengths[wide_enough]
+            
+            # Every candidate touches its unit (distance 0), so pick the
+            # corridor sharing the longest edge, ties going to list order
+            order = np.lexsort((corridor_idx, -lengths, unit_idx))
+            _, first = np.unique(unit_idx[order], return_index=True)
+            
+            for intersection in intersections[order][first]:
+                # Find midpoint for door placement, as a plain (x, y) pair
+                if hasattr(intersection, 'coords'):
+                    coords = shapely.get_coordinates(intersection)
+                    x, y = coords[len(coords) // 2]
+                else:
+                    x, y = shapely.get_coordinates(intersection.centroid)[0]
                 
-                # Find the corridor closest to this unit
-                min_dist = float('inf')
-                closest_corridor = None
-                closest_point = None
+                # Create door symbol (arc + line)
                 
-                for corridor in corridors:
-                    # Find intersection line between unit and corridor
-                    if unit_poly.touches(corridor) or unit_poly.intersects(corridor):
-                        # Get the shared boundary
-                        intersection = unit_poly.boundary.intersection(corridor.boundary)
-                        
-                        if intersection.length > door_width:
-                            # Find midpoint for door placement
-                            if hasattr(intersection, 'coords'):
-                                coords = list(intersection.coords)
-                                mid_idx = len(coords) // 2
-                                door_point = Point(coords[mid_idx])
-                            else:
-                                door_point = intersection.centroid
-                            
-                            closest_corridor = corridor
-                            closest_point = door_point
-                            break
+                # Door opening line
+                self.modelspace.add_line(
+                    (x - door_width/2, y),
+                    (x + door_width/2, y),
+                    dxfattribs=self._DOOR_ATTRIBS
+                )
                 
-                if closest_point:
-                    # Create door symbol (arc + line)
-                    x, y = closest_point.x, closest_point.y
-                    
-                    # Door opening line
-                    self.modelspace.add_line(
-                        (x - door_width/2, y),
-                        (x + door_width/2, y),
-                        dxfattribs={'layer': 'DOORS', 'color': 3}
-                    )
-                    
-                    # Door swing arc (90 degree arc)
-                    self.modelspace.add_arc(
-                        center=(x - door_width/2, y),
-                        radius=door_width,
-                        start_angle=0,
-                        end_angle=90,
-                        dxfattribs={'layer': 'DOORS', 'color': 3}
-                    )
-                    
-                    doors_added += 1
+                # Door swing arc (90 degree arc)
+                self.modelspace.add_arc(
+                    center=(x - door_width/2, y),
+                    radius=door_width,
+                    start_angle=0,
+                    end_angle=90,
+                    dxfattribs=self._DOOR_ATTRIBS
+                )
+                
+                doors_added += 1
             
             logger.info(f"Added {doors_added} doors to DXF")
         except Exception as e:
@@ -225,7 +315,7 @@ class DXFExporter:
                 p1=(minx, miny),
                 p2=(maxx, miny),
                 dimstyle='EZ_M_100_H25_CM',
-                dxfattribs={'layer': 'DIMENSIONS'}
+                dxfattribs=self._DIMENSION_ATTRIBS
             )
             
             # Overall height dimension
@@ -235,7 +325,7 @@ class DXFExporter:
                 p2=(minx, maxy),
                 angle=90,
                 dimstyle='EZ_M_100_H25_CM',
-                dxfattribs={'layer': 'DIMENSIONS'}
+                dxfattribs=self._DIMENSION_ATTRIBS
             )
             
             logger.info("Added dimensions to DXF")
@@ -297,9 +387,15 @@ class DXFExporter:
             logger.error(f"Failed to add title block: {e}")
     
     def save(self, file_path: str) -> bool:
-        """Save DXF document to file."""
+        """
+        Save DXF document to file.
+        
+        Written through a 1 MiB buffered stream to avoid many small writes.
+        """
         try:
-            self.doc.saveas(file_path)
+            with open(file_path, 'wt', encoding=self.doc.output_encoding,
+                      errors='dxfreplace', buffering=1024 * 1024) as f:
+                self.doc.write(f)
             logger.info(f"Saved DXF to: {file_path}")
             return True
         except Exception as e:
@@ -3,7 +3,10 @@ FloorPlanGen - DXF Reader Module
 Reads DXF files and extracts boundaries, obstacles, and constraints.
 """
 
+import collections
 import ezdxf
+import numpy as np
+import shapely
 from shapely.geometry import Polygon, Point, LineString, MultiPolygon
 from shapely.ops import unary_union
 from typing import List, Dict, Tuple, Optional
@@ -11,6 +14,28 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+_POLYLINE_TYPES = {'LWPOLYLINE', 'POLYLINE'}
+
+
+def _build_polygons(rings: List[np.ndarray], min_area: float = None) -> List[Polygon]:
+    """
+    Build valid polygons from closed point rings.
+    
+    All rings are stacked into one coordinate array so GEOS constructs
+    every polygon (and checks its validity and area) in a single batched call.
+    """
+    rings = [ring for ring in rings if len(ring) >= 4]
+    if not rings:
+        return []
+    
+    coords = np.concatenate(rings)
+    indices = np.repeat(np.arange(len(rings)), [len(ring) for ring in rings])
+    polygons = shapely.polygons(shapely.linearrings(coords, indices=indices))
+    keep = shapely.is_valid(polygons)
+    if min_area is not None:
+        keep &= shapely.area(polygons) > min_area
+    return polygons[keep].tolist()
+
 
 class DXFReader:
     """Reads and parses DXF files for floor plan generation."""
@@ -18,12 +43,51 @@ class DXFReader:
     def __init__(self):
         self.doc = None
         self.modelspace = None
+        self._by_layer = collections.defaultdict(list)
+    
+    def _entities_on(self, layer_name: str):
+        """Entities on a layer (empty if the layer holds none)."""
+        return self._by_layer.get(layer_name, ())
+    
+    def _extract_polygons(self, entities, min_area: float = None) -> List[Polygon]:
+        """Build valid polygons (optionally above min_area) from the closed polylines among entities."""
+        rings = []
+        for entity in entities:
+            dxftype = entity.dxftype()
+            if dxftype in _POLYLINE_TYPES:
+                if dxftype == 'LWPOLYLINE':
+                    # Get points from LWPOLYLINE in one call
+                    xy = np.asarray(entity.get_points('xy'), dtype=float)
+                else:
+                    # Get vertex locations from POLYLINE
+                    xy = np.array(list(entity.points()), dtype=float).reshape(-1, 3)[:, :2]
+                
+                if len(xy) >= 3:
+                    # A ring's area never exceeds its bounding box: skip
+                    # small candidates before building any geometry
+                    if min_area is not None:
+                        span_x, span_y = np.ptp(xy, axis=0)
+                        if span_x * span_y <= min_area:
+                            continue
+                    
+                    # Close the polygon if not already closed (whatever the
+                    # closed flag says, some writers repeat the start vertex)
+                    if not np.array_equal(xy[0], xy[-1]):
+                        xy = np.vstack([xy, xy[:1]])
+                    rings.append(xy)
+        
+        return _build_polygons(rings, min_area)
     
     def load_dxf(self, file_path: str) -> bool:
         """Load a DXF file."""
         try:
             self.doc = ezdxf.readfile(file_path)
             self.modelspace = self.doc.modelspace()
+            
+            # Index modelspace entities by layer in a single pass
+            self._by_layer = collections.defaultdict(list)
+            for entity in self.modelspace:
+                self._by_layer[entity.dxf.layer].append(entity)
             logger.info(f"Successfully loaded DXF file: {file_path}")
             return True
         except Exception as e:
@@ -40,56 +104,21 @@ class DXFReader:
             boundaries = []
             
             # Try specified layer first
-            for entity in self.modelspace.query(f'*[layer=="{layer_name}"]'):
-                if entity.dxftype() in ['LWPOLYLINE', 'POLYLINE']:
-                    points = []
-                    
-                    if entity.dxftype() == 'LWPOLYLINE':
-                        # Get points from LWPOLYLINE
-                        for point in entity.get_points('xy'):
-                            points.append((point[0], point[1]))
-                    else:
-                        # Get points from POLYLINE
-                        for vertex in entity.vertices:
-                            points.append((vertex.dxf.location.x, vertex.dxf.location.y))
-                    
-                    if len(points) >= 3:
-                        # Close the polygon if not already closed
-                        if points[0] != points[-1]:
-                            points.append(points[0])
-                        
-                        polygon = Polygon(points)
-                        if polygon.is_valid:
-                            boundaries.append(polygon)
+            boundaries.extend(self._extract_polygons(self._entities_on(layer_name)))
             
             # If no boundary found on specified layer, try all layers
             if not boundaries:
                 logger.warning(f"No boundaries found on layer '{layer_name}', trying all layers...")
                 
-                all_layers = self.get_layers()
-                for layer in all_layers:
+                # Only layers that actually hold modelspace entities
+                for layer, entities in self._by_layer.items():
                     if layer == layer_name:  # Skip already tried layer
                         continue
                     
-                    for entity in self.modelspace.query(f'*[layer=="{layer}"]'):
-                        if entity.dxftype() in ['LWPOLYLINE', 'POLYLINE']:
-                            points = []
-                            
-                            if entity.dxftype() == 'LWPOLYLINE':
-                                for point in entity.get_points('xy'):
-                                    points.append((point[0], point[1]))
-                            else:
-                                for vertex in entity.vertices:
-                                    points.append((vertex.dxf.location.x, vertex.dxf.location.y))
-                            
-                            if len(points) >= 3:
-                                if points[0] != points[-1]:
-                                    points.append(points[0])
-                                
-                                polygon = Polygon(points)
-                                if polygon.is_valid and polygon.area > 10:  # Minimum 10 m²
-                                    boundaries.append(polygon)
-                                    logger.info(f"Found boundary on layer '{layer}': {polygon.area:.2f} m²")
+                    # Minimum 10 m²
+                    for polygon in self._extract_polygons(entities, min_area=10):
+                        boundaries.append(polygon)
+                        logger.info(f"Found boundary on layer '{layer}': {polygon.area:.2f} m²")
             
             if not boundaries:
                 logger.warning(f"No valid boundaries found in any layer")
@@ -97,7 +126,8 @@ class DXFReader:
             
             # If multiple boundaries, use the largest one
             if len(boundaries) > 1:
-                boundary = max(boundaries, key=lambda p: p.area)
+                areas = shapely.area(np.array(boundaries, dtype=object))
+                boundary = boundaries[int(areas.argmax())]
                 logger.info(f"Multiple boundaries found, using largest: {boundary.area:.2f} m²")
             else:
                 boundary = boundaries[0]
@@ -119,40 +149,36 @@ class DXFReader:
         obstacles = []
         
         try:
+            centers, radii, insert_points = [], [], []
             for layer_name in layer_names:
-                for entity in self.modelspace.query(f'*[layer=="{layer_name}"]'):
-                    if entity.dxftype() == 'CIRCLE':
+                entities = self._entities_on(layer_name)
+                for entity in entities:
+                    dxftype = entity.dxftype()
+                    if dxftype == 'CIRCLE':
                         # Circular columns
-                        center = (entity.dxf.center.x, entity.dxf.center.y)
-                        radius = entity.dxf.radius
-                        circle = Point(center).buffer(radius)
-                        obstacles.append(circle)
-                    
-                    elif entity.dxftype() in ['LWPOLYLINE', 'POLYLINE']:
-                        # Polygonal obstacles
-                        points = []
-                        
-                        if entity.dxftype() == 'LWPOLYLINE':
-                            for point in entity.get_points('xy'):
-                                points.append((point[0], point[1]))
-                        else:
-                            for vertex in entity.vertices:
-                                points.append((vertex.dxf.location.x, vertex.dxf.location.y))
-                        
-                        if len(points) >= 3:
-                            if points[0] != points[-1]:
-                                points.append(points[0])
-                            polygon = Polygon(points)
-                            if polygon.is_valid:
-                                obstacles.append(polygon)
+                        centers.append((entity.dxf.center.x, entity.dxf.center.y))
+                        radii.append(entity.dxf.radius)
                     
-                    elif entity.dxftype() == 'INSERT':
+                    elif dxftype == 'INSERT':
                         # Block references (like column symbols)
-                        insert_point = (entity.dxf.insert.x, entity.dxf.insert.y)
-                        # Assume 0.4m x 0.4m column as default
-                        size = 0.4
-                        column = Point(insert_point).buffer(size / 2, cap_style=3)
-                        obstacles.append(column)
+                        insert_points.append((entity.dxf.insert.x, entity.dxf.insert.y))
+                
+                # Polygonal obstacles
+                obstacles.extend(self._extract_polygons(entities))
+            
+            # Buffer all circle centers with their own radii in one GEOS call
+            # (16 segments per quarter circle, as Point.buffer draws them)
+            if centers:
+                circles = shapely.buffer(shapely.points(np.array(centers)), np.array(radii), quad_segs=16)
+                obstacles.extend(circles.tolist())
+            
+            if insert_points:
+                # Assume 0.4m x 0.4m column as default
+                size = 0.4
+                columns = shapely.buffer(
+                    shapely.points(np.array(insert_points)), size / 2, cap_style='square'
+                )
+                obstacles.extend(columns.tolist())
             
             logger.info(f"Extracted {len(obstacles)} obstacles")
             return obstacles
@@ -177,25 +203,7 @@ class DXFReader:
         
         try:
             for layer_name in layer_names:
-                elements = []
-                
-                for entity in self.modelspace.query(f'*[layer=="{layer_name}"]'):
-                    if entity.dxftype() in ['LWPOLYLINE', 'POLYLINE']:
-                        points = []
-                        
-                        if entity.dxftype() == 'LWPOLYLINE':
-                            for point in entity.get_points('xy'):
-                                points.append((point[0], point[1]))
-                        else:
-                            for vertex in entity.vertices:
-                                points.append((vertex.dxf.location.x, vertex.dxf.location.y))
-                        
-                        if len(points) >= 3:
-                            if points[0] != points[-1]:
-                                points.append(points[0])
-                            polygon = Polygon(points)
-                            if polygon.is_valid:
-                                elements.append(polygon)
+                elements = self._extract_polygons(self._entities_on(layer_name))
                 
                 # Map layer name to element type
                 layer_lower = layer_name.lower()
@@ -215,6 +223,27 @@ class DXFReader:
             logger.error(f"Failed to extract fixed elements: {e}")
             return fixed_elements
     
+    def extract_all(
+        self,
+        boundary_layer: str = "BOUNDARY",
+        obstacle_layers: List[str] = None,
+        fixed_layers: List[str] = None
+    ) -> Dict:
+        """
+        Extract boundary, obstacles and fixed elements together.
+        
+        All three read from the same layer index, so the modelspace is
+        scanned only once.
+        
+        Returns:
+            Dict with "boundary", "obstacles" and "fixed_elements" keys
+        """
+        return {
+            "boundary": self.extract_boundary(boundary_layer),
+            "obstacles": self.extract_obstacles(obstacle_layers),
+            "fixed_elements": self.extract_fixed_elements(fixed_layers)
+        }
+    
     def get_layers(self) -> List[str]:
         """Get all layer names in the DXF file."""
         if not self.doc:
@@ -5,26 +5,27 @@ Provides REST API for floor plan generation.
 
 from fastapi import FastAPI, HTTPException, UploadFile, File
 from fastapi.responses import FileResponse
-from pydantic import BaseModel
-from typing import List, Dict, Optional
+from pydantic import BaseModel, ConfigDict, PrivateAttr, model_validator
+from typing import List, Dict, Optional, Union
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import Counter, OrderedDict
+from functools import partial
+import asyncio
 import logging
+import hashlib
 import json
 import os
 import tempfile
 import uuid
 import random
+import shutil
 import time
-import httpx  # Add HTTP client for downloading DXF
 from pathlib import Path
-import ezdxf
 
-from .dxf_reader import DXFReader
-from .space_partition import ArchitecturalSpacePartitioner as SpacePartitioner
-from .professional_layout_engine import ProfessionalLayoutEngine  # NEW: FIXED professional layout engine
-from .constraint_solver import ConstraintSolver
-from .dxf_exporter import DXFExporter
-from .svg_generator import SVGGenerator
-from .architectural_validator import ArchitecturalConstraintsValidator
+# Geometry, DXF, HTTP and solver modules (ezdxf, shapely, OR-Tools, httpx)
+# are imported inside the handlers that use them, so the app starts fast
+# and the health endpoints work without them installed.
 
 # Configure logging
 logging.basicConfig(
@@ -45,14 +46,190 @@ TEMP_DIR = Path("/tmp/floorplangen")
 TEMP_DIR.mkdir(exist_ok=True)
 
 
+def project_dir(project_id: str, create: bool = True) -> Path:
+    """Per-project directory under TEMP_DIR holding its input and variant files."""
+    path = TEMP_DIR / project_id
+    if path.resolve().parent != TEMP_DIR.resolve():
+        raise ValueError(f"Invalid project id: {project_id!r}")
+    if create:
+        path.mkdir(exist_ok=True)
+    return path
+
+# Worker processes for CPU-bound variant generation
+VARIANT_POOL = ProcessPoolExecutor(max_workers=os.cpu_count())
+
+
+def _restart_variant_pool(broken: ProcessPoolExecutor) -> None:
+    """Replace the variant pool after a worker died; a broken pool rejects all later work."""
+    global VARIANT_POOL
+    if VARIANT_POOL is broken:
+        logger.warning("⚠️ Variant worker died, restarting the process pool")
+        broken.shutdown(wait=False, cancel_futures=True)
+        VARIANT_POOL = ProcessPoolExecutor(max_workers=os.cpu_count())
+
+
+async def _run_in_variant_pool(tasks: List) -> List:
+    """
+    Run callables in the variant pool, retrying once on a fresh pool if a worker dies.
+    
+    Returns:
+        One result (or raised exception) per task, in order
+    
+    Raises:
+        BrokenProcessPool: If the pool broke again on the retry
+    """
+    loop = asyncio.get_running_loop()
+    results = [None] * len(tasks)
+    pending = list(range(len(tasks)))
+    for attempt in range(2):
+        pool = VARIANT_POOL
+        try:
+            futures = [loop.run_in_executor(pool, tasks[i]) for i in pending]
+        except BrokenProcessPool as e:
+            # Broken before this request (a worker died during an earlier one)
+            for i in pending:
+                results[i] = e
+        else:
+            for i, result in zip(pending, await asyncio.gather(*futures, return_exceptions=True)):
+                results[i] = result
+        
+        pending = [i for i in pending if isinstance(results[i], BrokenProcessPool)]
+        if not pending:
+            return results
+        _restart_variant_pool(pool)
+    raise BrokenProcessPool(f"Variant workers died twice, {len(pending)} variants not generated")
+
+# Parsed DXF geometry keyed by (project id, file content hash, boundary layer),
+# LRU-evicted; a project's entries go when the project is removed
+_DXF_CACHE: "OrderedDict[tuple, Dict]" = OrderedDict()
+_DXF_CACHE_SIZE = 32
+
+
+app.state.http = None
+
+
+def _http_client():
+    """Shared HTTP client, opened on first use so DXF downloads reuse pooled connections."""
+    if app.state.http is None:
+        import httpx
+        app.state.http = httpx.AsyncClient(
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+        )
+    return app.state.http
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Close the shared HTTP client and stop the variant workers."""
+    if app.state.http is not None:
+        await app.state.http.aclose()
+    VARIANT_POOL.shutdown(wait=False, cancel_futures=True)
+
+
 # ==================== Pydantic Models ====================
 
+def _drop_none(data):
+    """Treat null values like missing keys, so the field defaults apply."""
+    if isinstance(data, dict):
+        return {key: value for key, value in data.items() if value is not None}
+    return data
+
+
+class UnitTypeSpec(BaseModel):
+    """One requested unit type, accepted in the V1 (counts) or V2 (percentages) shape."""
+    model_config = ConfigDict(extra="allow")
+    
+    type: str = "Studio"
+    count: Union[int, float] = 0
+    percentage: Union[int, float] = 0
+    priority: Union[int, float] = 1
+    min_area: Union[int, float] = 50
+    max_area: Union[int, float] = 100
+    
+    @model_validator(mode="before")
+    @classmethod
+    def _flatten_area_range(cls, data):
+        """Accept the area range either flat or nested as net_area_m2 {min, max}."""
+        data = _drop_none(data)
+        if isinstance(data, dict) and not ("min_area" in data and "max_area" in data):
+            area_range = _drop_none(data.get("net_area_m2") or {})
+            data = {
+                **data,
+                "min_area": area_range.get("min", 50),
+                "max_area": area_range.get("max", 100)
+            }
+        return data
+    
+    def layout_spec(self) -> Dict:
+        """Unit spec in the V2 format expected by the layout engine."""
+        unit_spec = {
+            "type": self.type,
+            "priority": self.priority,
+            "area": {  # ✅ NEW: Nested area object
+                "min": self.min_area,
+                "max": self.max_area,
+                "target": (self.min_area + self.max_area) / 2
+            }
+        }
+        
+        # Add percentage OR count (V2 vs V1)
+        if self.percentage > 0:
+            unit_spec["percentage"] = self.percentage
+        elif self.count > 0:
+            unit_spec["count"] = self.count
+        else:
+            unit_spec["count"] = 1  # Default
+        
+        return unit_spec
+
+
+class Constraints(BaseModel):
+    """
+    Generation constraints; unknown keys are kept.
+    
+    The typed fields only drive the layout. The constraint solver gets the
+    constraints exactly as the client sent them (client_dict()), so parsing
+    them never changes a variant's score.
+    """
+    model_config = ConfigDict(extra="allow")
+    
+    units: List[UnitTypeSpec] = []
+    # Older clients send the unit list as unit_types
+    unit_types: List[UnitTypeSpec] = []
+    architectural_constraints: Dict = {}
+    core: Dict = {}
+    circulation: Dict = {}
+    generation_strategy: str = "fill_available"
+    total_units: Dict = {}
+    distribution_strategy: Dict = {}
+    
+    _client_dict: Dict = PrivateAttr(default_factory=dict)
+    
+    @model_validator(mode="wrap")
+    @classmethod
+    def _keep_client_dict(cls, data, handler):
+        constraints = handler(_drop_none(data))
+        if isinstance(data, dict):
+            constraints._client_dict = data
+        return constraints
+    
+    def client_dict(self) -> Dict:
+        """The constraints as the client sent them."""
+        return self._client_dict
+    
+    def unit_specs(self) -> List[UnitTypeSpec]:
+        """Requested unit types, from units or else the older unit_types."""
+        return self.units or self.unit_types
+
+
 class GenerateRequest(BaseModel):
     project_id: str
     dxf_url: Optional[str] = None
     dxf_file_path: Optional[str] = None
     boundary_layer: str = "BOUNDARY"
-    constraints: Dict
+    constraints: Constraints
     variant_count: int = 5
 
 
@@ -121,44 +298,50 @@ async def generate_floor_plan(request: GenerateRequest):
     4. Optimizes with constraints
     5. Exports DXF files
     """
+    # Reject project ids that would escape TEMP_DIR before any work starts
+    try:
+        project_dir(request.project_id, create=False)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     try:
         logger.info(f"Received generation request for project {request.project_id}")
         
         # Create job ID
         job_id = f"job-{uuid.uuid4().hex[:12]}"
         
-        # Get DXF file path
+        # Get DXF file path (None means fall back to the sample DXF)
+        dxf_path = None
         if request.dxf_file_path:
-            dxf_path = request.dxf_file_path
+            dxf_path = Path(request.dxf_file_path)
+            if not dxf_path.exists():
+                logger.warning(f"DXF file not found: {dxf_path}, creating sample")
+                dxf_path = None
         elif request.dxf_url:
             # Download DXF from URL
             logger.info(f"Downloading DXF from URL: {request.dxf_url}")
-            dxf_path = str(TEMP_DIR / f"{request.project_id}_input.dxf")
+            download_path = project_dir(request.project_id) / "input.dxf"
             
             try:
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    response = await client.get(request.dxf_url)
+                async with _http_client().stream("GET", request.dxf_url) as response:
                     response.raise_for_status()
                     
-                    # Save DXF content to file
-                    with open(dxf_path, 'wb') as f:
-                        f.write(response.content)
-                    
-                    logger.info(f"Downloaded DXF: {len(response.content)} bytes → {dxf_path}")
+                    # Stream DXF content to file chunk by chunk
+                    with open(download_path, 'wb') as f:
+                        async for chunk in response.aiter_bytes(chunk_size=65536):
+                            f.write(chunk)
+                
+                logger.info(f"Downloaded DXF: {download_path.stat().st_size} bytes → {download_path}")
+                dxf_path = download_path
                     
             except Exception as download_error:
                 logger.error(f"Failed to download DXF from {request.dxf_url}: {download_error}")
-                # Fallback to sample DXF
                 logger.warning("Falling back to sample DXF")
-                dxf_path = create_sample_dxf(request.project_id)
         else:
             # No DXF provided, create a sample for testing
             logger.warning(f"No DXF file provided, creating sample for project {request.project_id}")
-            dxf_path = create_sample_dxf(request.project_id)
         
-        # Check if file exists, if not create sample
-        if not os.path.exists(dxf_path):
-            logger.warning(f"DXF file not found: {dxf_path}, creating sample")
+        if dxf_path is None:
             dxf_path = create_sample_dxf(request.project_id)
         
         # Generate variants
@@ -205,16 +388,101 @@ async def generate_floor_plan(request: GenerateRequest):
             message=status_message
         )
         
+    except BrokenProcessPool as e:
+        logger.error(f"Generation failed: {e}")
+        raise HTTPException(status_code=503, detail="Variant workers unavailable, please retry")
     except Exception as e:
         logger.error(f"Generation failed: {e}")
         raise HTTPException(status_code=500, detail=f"Generation failed: {str(e)}")
 
 
+def _read_dxf_cached(project_id: str, dxf_path: Path, boundary_layer: str) -> Dict:
+    """
+    Parse a DXF and extract its geometry, reusing the project's earlier results.
+    
+    Args:
+        project_id: Project the DXF belongs to
+        dxf_path: Path to the DXF file
+        boundary_layer: Layer holding the boundary polyline
+    
+    Returns:
+        Dict with "boundary", "obstacles" and "fixed_elements" keys
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(dxf_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    key = (project_id, digest.hexdigest(), boundary_layer)
+    
+    extracted = _DXF_CACHE.get(key)
+    if extracted is not None:
+        _DXF_CACHE.move_to_end(key)
+        logger.info(f"Reusing parsed DXF for {dxf_path}")
+        return extracted
+    
+    from .dxf_reader import DXFReader
+    
+    reader = DXFReader()
+    if not reader.load_dxf(dxf_path):
+        raise Exception("Failed to load DXF file")
+    
+    extracted = reader.extract_all(boundary_layer)
+    
+    # Only cache usable results so a missing boundary is retried
+    if extracted["boundary"]:
+        _DXF_CACHE[key] = extracted
+        if len(_DXF_CACHE) > _DXF_CACHE_SIZE:
+            _DXF_CACHE.popitem(last=False)
+    return extracted
+
+
+def _variant_invariants(constraints) -> Dict:
+    """
+    Settings derived from the request constraints, shared by every variant.
+    
+    Args:
+        constraints: Constraints model (or an equivalent raw dict)
+    
+    Returns:
+        Dict with "arch_constraints", "core_config", "circulation_config",
+        "unit_constraints", "solver_constraints" and "door_width" keys
+    """
+    if isinstance(constraints, dict):
+        constraints = Constraints.model_validate(constraints)
+    
+    # Extract architectural constraints if provided
+    arch_constraints = constraints.architectural_constraints
+    
+    # Prepare unit types for layout engine - support V2 (percentages) and V1 (counts)
+    unit_types_for_layout = [uc.layout_spec() for uc in constraints.unit_specs()]
+    logger.info(f"Planning units (V2 format): {unit_types_for_layout}")
+    
+    # Get door width from architectural constraints
+    door_width = 0.9  # Default minimum for accessibility
+    if arch_constraints and "accessibility" in arch_constraints:
+        door_width = arch_constraints.get("accessibility", {}).get("wheelchair_access", {}).get("door_width_m", 0.9)
+    
+    return {
+        "arch_constraints": arch_constraints,
+        "core_config": arch_constraints.get("core") or constraints.core,
+        "circulation_config": arch_constraints.get("circulation") or constraints.circulation,
+        # NEW V2: Layout units with DYNAMIC generation (percentages support)
+        "unit_constraints": {
+            "generation_strategy": constraints.generation_strategy,
+            "units": unit_types_for_layout,
+            "total_units": constraints.total_units,
+            "distribution_strategy": constraints.distribution_strategy
+        },
+        "solver_constraints": constraints.client_dict(),
+        "door_width": door_width
+    }
+
+
 async def generate_variants_internal(
     project_id: str,
-    dxf_path: str,
+    dxf_path: Path,
     boundary_layer: str,
-    constraints: Dict,
+    constraints: Constraints,
     variant_count: int
 ) -> List[Dict]:
     """Internal function to generate multiple variants."""
@@ -222,50 +490,58 @@ async def generate_variants_internal(
     variants = []
     
     try:
-        # Step 1: Read DXF
-        reader = DXFReader()
-        if not reader.load_dxf(dxf_path):
-            raise Exception("Failed to load DXF file")
-        
-        boundary = reader.extract_boundary(boundary_layer)
+        # Step 1: Read DXF (reused when the same file was parsed before)
+        extracted = _read_dxf_cached(project_id, dxf_path, boundary_layer)
+        boundary = extracted["boundary"]
         if not boundary:
             raise Exception(f"No boundary found on layer {boundary_layer}")
         
-        obstacles = reader.extract_obstacles()
-        fixed_elements = reader.extract_fixed_elements()
+        obstacles = extracted["obstacles"]
+        fixed_elements = extracted["fixed_elements"]
         
         logger.info(f"Extracted: boundary={boundary.area:.2f}m², obstacles={len(obstacles)}")
         
-        # Step 2: Generate multiple variants with error handling
+        # Constraint-derived settings are the same for every variant
+        invariants = _variant_invariants(constraints)
+        
+        # Step 2: Generate variants in parallel worker processes.
+        # Geometries cross the process boundary pickled (as WKB).
+        tasks = [
+            partial(
+                generate_single_variant,
+                project_id=project_id,
+                variant_number=i + 1,
+                boundary=boundary,
+                obstacles=obstacles,
+                fixed_elements=fixed_elements,
+                constraints=None,
+                invariants=invariants
+            )
+            for i in range(variant_count)
+        ]
+        results = await _run_in_variant_pool(tasks)
+        
         successful_count = 0
         failed_count = 0
         
-        for i in range(variant_count):
-            try:
-                variant = generate_single_variant(
-                    project_id=project_id,
-                    variant_number=i + 1,
-                    boundary=boundary,
-                    obstacles=obstacles,
-                    fixed_elements=fixed_elements,
-                    constraints=constraints
-                )
-                variants.append(variant)
-                successful_count += 1
-                logger.info(f"✅ Variant {i+1}/{variant_count} generated successfully ({len(variant.get('units', []))} units)")
-            except Exception as e:
+        for i, result in enumerate(results):
+            if isinstance(result, Exception):
                 failed_count += 1
-                logger.error(f"❌ Failed to generate variant {i+1}/{variant_count}: {e}")
+                logger.error(f"❌ Failed to generate variant {i+1}/{variant_count}: {result}")
                 
                 # Create placeholder variant with 0 units
                 placeholder_variant = create_failed_variant_placeholder(
                     project_id=project_id,
                     variant_number=i + 1,
                     boundary=boundary,
-                    error_message=str(e)
+                    error_message=str(result)
                 )
                 variants.append(placeholder_variant)
-                logger.warning(f"Created placeholder variant {i+1} with 0 units (error: {str(e)[:100]})")
+                logger.warning(f"Created placeholder variant {i+1} with 0 units (error: {str(result)[:100]})")
+            else:
+                variants.append(result)
+                successful_count += 1
+                logger.info(f"✅ Variant {i+1}/{variant_count} generated successfully ({len(result.get('units', []))} units)")
         
         logger.info(f"🎯 Variant generation complete: {successful_count} successful, {failed_count} failed, {len(variants)} total")
         return variants
@@ -281,23 +557,37 @@ def generate_single_variant(
     boundary,
     obstacles,
     fixed_elements,
-    constraints: Dict
+    constraints: Constraints,
+    invariants: Optional[Dict] = None
 ) -> Dict:
-    """Generate a single floor plan variant with randomization for diversity."""
+    """
+    Generate a single floor plan variant with randomization for diversity.
+    
+    Args:
+        invariants: Settings from _variant_invariants(constraints); computed
+            here when not supplied by the caller
+    """
+    from .professional_layout_engine import ProfessionalLayoutEngine  # NEW: FIXED professional layout engine
+    from .constraint_solver import ConstraintSolver
+    from .dxf_exporter import DXFExporter
+    from .svg_generator import SVGGenerator
+    from .architectural_validator import ArchitecturalConstraintsValidator
     
     try:
-        # Set unique random seed for each variant
-        random.seed(int(time.time() * 1000) + variant_number)
+        # Unique, private random generator for each variant
+        seed = (int(time.time() * 1000) + variant_number) & 0xFFFFFFFF
+        rng = random.Random(seed)
         
-        # Extract architectural constraints if provided
-        arch_constraints = constraints.get("architectural_constraints", {})
+        if invariants is None:
+            invariants = _variant_invariants(constraints)
+        arch_constraints = invariants["arch_constraints"]
         
         # Step 1: Professional Architectural Layout (FIXED ENGINE!)
         logger.info("Using ProfessionalLayoutEngine - FIXED for visible corridors and proper connectivity")
         layout_engine = ProfessionalLayoutEngine(boundary, obstacles)
         
         # Place core with randomization
-        core_config = arch_constraints.get("core") or constraints.get("core", {})
+        core_config = invariants["core_config"]
         
         # Get core area from architectural constraints or use default
         if core_config and "area_m2" in core_config:
@@ -306,18 +596,18 @@ def generate_single_variant(
             core_area_max = core_area_config.get("max", 60)
             core_area_target = core_area_config.get("target", 40)
             # Randomize within user-defined range
-            core_area = random.uniform(core_area_min, core_area_max)
+            core_area = rng.uniform(core_area_min, core_area_max)
         else:
             # Default randomization (±10%)
             base_core_area = 40.0
-            core_area = base_core_area * (1.0 + random.uniform(-0.1, 0.1))
+            core_area = base_core_area * (1.0 + rng.uniform(-0.1, 0.1))
         
         # Get preferred location from architectural constraints
         preferred_location = core_config.get("preferred_location", "center")
         if variant_number > 1:
             # For variant 2+, try different locations
             core_locations = ["center", "north", "south", "east", "west"]
-            preferred_location = random.choice(core_locations)
+            preferred_location = rng.choice(core_locations)
             logger.info(f"Variant {variant_number}: Using core location '{preferred_location}'")
         
         # ✅ V2.5.1: Multi-Core Support
@@ -339,7 +629,7 @@ def generate_single_variant(
             cores = [core] if core else []
         
         # Create professional corridor network (spine + branches)
-        circulation_config = arch_constraints.get("circulation") or constraints.get("circulation", {})
+        circulation_config = invariants["circulation_config"]
         
         if circulation_config and "corridor_width_m" in circulation_config:
             corridor_width_config = circulation_config["corridor_width_m"]
@@ -347,17 +637,17 @@ def generate_single_variant(
             corridor_width_max = corridor_width_config.get("max", 2.5)
             corridor_width_target = corridor_width_config.get("target", 2.2)
             # Randomize within user-defined range
-            corridor_width = random.uniform(corridor_width_min, corridor_width_max)
+            corridor_width = rng.uniform(corridor_width_min, corridor_width_max)
         else:
             # Default randomization (±10%)
             base_corridor_width = circulation_config.get("corridor_width_m", {}).get("target", 2.2)
-            corridor_width = base_corridor_width * (1.0 + random.uniform(-0.1, 0.1))
+            corridor_width = base_corridor_width * (1.0 + rng.uniform(-0.1, 0.1))
         
         # Get layout type from architectural constraints
         layout_type = circulation_config.get("layout_type", "double_loaded")
         if variant_number > 1:
             layout_types = ["double_loaded", "single_loaded"]
-            layout_type = random.choice(layout_types)
+            layout_type = rng.choice(layout_types)
         
         # ✅ V2.5.1: Corridor Pattern Support
         corridor_pattern = circulation_config.get("corridor_pattern", "auto")
@@ -370,63 +660,11 @@ def generate_single_variant(
             pattern=corridor_pattern  # ✅ V2.5.1: Support manual pattern selection
         )
         
-        # Prepare unit types for layout engine - support V2 (percentages) and V1 (counts)
-        units_config = constraints.get("units") or constraints.get("unit_types", [])
-        unit_types_for_layout = []
-        
-        for uc in units_config:
-            # Support both V2 and V1 structures
-            unit_type = uc.get("type", "Studio")
-            count = uc.get("count", 0)
-            percentage = uc.get("percentage", 0)
-            priority = uc.get("priority", 1)
-            
-            # Extract area range
-            if "min_area" in uc and "max_area" in uc:
-                min_area = uc.get("min_area", 50)
-                max_area = uc.get("max_area", 100)
-            else:
-                area_range = uc.get("net_area_m2", {})
-                min_area = area_range.get("min", 50)
-                max_area = area_range.get("max", 100)
-            
-            target_area = (min_area + max_area) / 2
-            
-            # Build V2 format for layout engine
-            unit_spec = {
-                "type": unit_type,
-                "priority": priority,
-                "area": {  # ✅ NEW: Nested area object
-                    "min": min_area,
-                    "max": max_area,
-                    "target": target_area
-                }
-            }
-            
-            # Add percentage OR count (V2 vs V1)
-            if percentage > 0:
-                unit_spec["percentage"] = percentage
-            elif count > 0:
-                unit_spec["count"] = count
-            else:
-                unit_spec["count"] = 1  # Default
-            
-            unit_types_for_layout.append(unit_spec)
-        
-        logger.info(f"Planning units (V2 format): {unit_types_for_layout}")
-        
-        # NEW V2: Layout units with DYNAMIC generation (percentages support)
-        unit_constraints = {
-            "generation_strategy": constraints.get("generation_strategy", "fill_available"),
-            "units": unit_types_for_layout,
-            "total_units": constraints.get("total_units", {}),
-            "distribution_strategy": constraints.get("distribution_strategy", {})
-        }
-        
         units = layout_engine.layout_units_with_corridor_access(
             core=core,
             corridors=corridors,
-            unit_constraints=unit_constraints
+            unit_constraints=invariants["unit_constraints"],
+            seed=seed
         )
         
         # Calculate metrics (units area, corridor area, efficiency)
@@ -447,7 +685,7 @@ def generate_single_variant(
         }
         
         # Step 2: Constraint Solving & Validation
-        solver = ConstraintSolver(constraints)
+        solver = ConstraintSolver(invariants["solver_constraints"])
         validation_report = solver.validate_constraints(metrics, units)
         
         # Step 2.5: Architectural Validation (NEW!)
@@ -479,7 +717,8 @@ def generate_single_variant(
         
         # Step 3: Export DXF
         variant_id = f"var-{uuid.uuid4().hex[:12]}"
-        dxf_path = str(TEMP_DIR / f"{project_id}_{variant_id}.dxf")
+        proj_dir = project_dir(project_id)
+        dxf_path = str(proj_dir / f"{variant_id}.dxf")
         
         # Export to DXF with architectural constraints
         exporter = DXFExporter()
@@ -495,36 +734,33 @@ def generate_single_variant(
             # Could add to arch_constraints in future: arch_constraints.get("walls", {}).get("thickness_m", 0.2)
             pass
         
-        # Get door width from architectural constraints
-        door_width = 0.9  # Default minimum for accessibility
-        if arch_constraints and "accessibility" in arch_constraints:
-            door_width = arch_constraints.get("accessibility", {}).get("wheelchair_access", {}).get("door_width_m", 0.9)
-        
         exporter.add_walls(units, wall_thickness=wall_thickness)
-        exporter.add_doors(units, corridors, door_width=door_width)
+        exporter.add_doors(units, corridors, door_width=invariants["door_width"])
         exporter.add_title_block(
             project_name=project_id,
             variant_number=variant_number,
             area=metrics["total_area"],
             units_count=len(units)
         )
-        exporter.save(dxf_path)
         
-        # Generate SVG preview
-        svg_generator = SVGGenerator(width=800, height=600)
-        svg_content = svg_generator.generate_svg(boundary, core, corridors, units)
-        svg_path = str(TEMP_DIR / f"{project_id}_{variant_id}.svg")
-        
-        with open(svg_path, 'w') as f:
-            f.write(svg_content)
+        # Write the DXF in the background while the SVG preview is built
+        with ThreadPoolExecutor(max_workers=1) as io_pool:
+            dxf_saved = io_pool.submit(exporter.save, dxf_path)
+            
+            # Generate SVG preview
+            svg_generator = SVGGenerator(width=800, height=600)
+            svg_content = svg_generator.generate_svg(boundary, core, corridors, units)
+            svg_path = str(proj_dir / f"{variant_id}.svg")
+            
+            with open(svg_path, 'w') as f:
+                f.write(svg_content)
+            
+            dxf_saved.result()
         
         logger.info(f"Generated SVG preview at {svg_path}")
         
         # Prepare variant data
-        units_by_type = {}
-        for unit in units:
-            unit_type = unit["type"]
-            units_by_type[unit_type] = units_by_type.get(unit_type, 0) + 1
+        units_by_type = dict(Counter(unit["type"] for unit in units))
         
         variant_data = {
             "variant_id": variant_id,
@@ -595,39 +831,55 @@ def create_failed_variant_placeholder(
     return placeholder_data
 
 
-def create_sample_dxf(project_id: str) -> str:
+SAMPLE_TEMPLATE = TEMP_DIR / "__sample_template.dxf"
+
+
+def _build_sample_template() -> None:
+    """Write the sample DXF template once; its content never changes."""
+    import ezdxf
+    
+    doc = ezdxf.new('R2010')
+    msp = doc.modelspace()
+    
+    # Create larger sample boundary (50m x 30m = 1500m² rectangle)
+    # This allows for 10-15 units realistically
+    boundary_points = [
+        (0, 0),
+        (50, 0),
+        (50, 30),
+        (0, 30),
+        (0, 0)
+    ]
+    
+    msp.add_lwpolyline(
+        boundary_points,
+        dxfattribs={'layer': 'BOUNDARY', 'closed': True}
+    )
+    
+    # Add fewer columns for more usable space
+    columns = [
+        (15, 15, 0.4),
+        (35, 15, 0.4)
+    ]
+    
+    for x, y, radius in columns:
+        msp.add_circle((x, y), radius, dxfattribs={'layer': 'COLUMNS'})
+    
+    # Save under a temporary name so readers never see a partial template
+    partial_path = SAMPLE_TEMPLATE.with_suffix(f".{os.getpid()}.tmp")
+    doc.saveas(partial_path)
+    os.replace(partial_path, SAMPLE_TEMPLATE)
+
+
+def create_sample_dxf(project_id: str) -> Path:
     """Create a larger sample DXF file for realistic testing."""
     try:
-        doc = ezdxf.new('R2010')
-        msp = doc.modelspace()
-        
-        # Create larger sample boundary (50m x 30m = 1500m² rectangle)
-        # This allows for 10-15 units realistically
-        boundary_points = [
-            (0, 0),
-            (50, 0),
-            (50, 30),
-            (0, 30),
-            (0, 0)
-        ]
+        if not SAMPLE_TEMPLATE.exists():
+            _build_sample_template()
         
-        msp.add_lwpolyline(
-            boundary_points,
-            dxfattribs={'layer': 'BOUNDARY', 'closed': True}
-        )
-        
-        # Add fewer columns for more usable space
-        columns = [
-            (15, 15, 0.4),
-            (35, 15, 0.4)
-        ]
-        
-        for x, y, radius in columns:
-            msp.add_circle((x, y), radius, dxfattribs={'layer': 'COLUMNS'})
-        
-        # Save
-        output_path = str(TEMP_DIR / f"{project_id}_sample.dxf")
-        doc.saveas(output_path)
+        # Copy the cached template instead of rebuilding it with ezdxf
+        output_path = project_dir(project_id) / "sample.dxf"
+        shutil.copyfile(SAMPLE_TEMPLATE, output_path)
         
         logger.info(f"Created larger sample DXF (50x30m): {output_path}")
         return output_path
@@ -641,11 +893,17 @@ def create_sample_dxf(project_id: str) -> str:
 async def download_variant(variant_id: str, format: str = "dxf"):
     """Download generated DXF or SVG file."""
     try:
+        paths = variant_paths.get(variant_id)
+        
         if format == "svg":
-            # Find SVG file
-            svg_files = list(TEMP_DIR.glob(f"*{variant_id}.svg"))
+            # Known path first, directory scan only for unknown variants
+            if paths:
+                svg_files = [paths[1]]
+            else:
+                svg_files = list(TEMP_DIR.glob(f"*/{variant_id}.svg"))
             
-            if not svg_files:
+            # Files of evicted or deleted projects are gone
+            if not svg_files or not Path(svg_files[0]).exists():
                 raise HTTPException(status_code=404, detail="Variant SVG file not found")
             
             return FileResponse(
@@ -654,10 +912,14 @@ async def download_variant(variant_id: str, format: str = "dxf"):
                 filename=f"{variant_id}.svg"
             )
         else:
-            # Find DXF file
-            dxf_files = list(TEMP_DIR.glob(f"*{variant_id}.dxf"))
+            # Known path first, directory scan only for unknown variants
+            if paths:
+                dxf_files = [paths[0]]
+            else:
+                dxf_files = list(TEMP_DIR.glob(f"*/{variant_id}.dxf"))
             
-            if not dxf_files:
+            # Files of evicted or deleted projects are gone
+            if not dxf_files or not Path(dxf_files[0]).exists():
                 raise HTTPException(status_code=404, detail="Variant DXF file not found")
             
             return FileResponse(
@@ -681,10 +943,82 @@ if __name__ == "__main__":
 # ==================== Variants Storage ====================
 # Simple in-memory storage for generated variants
 # In production, this should use a proper database
-generated_variants_store = {}
+
+class VariantStore(OrderedDict):
+    """
+    Project -> variants mapping that keeps only the most recent projects.
+    
+    Storing or reading a project marks it as recently used; once more than
+    maxsize projects are held, the least recently used one is dropped and
+    its DXF/SVG files are deleted. The store also keeps variant_paths in step:
+    storing a project registers its variants' files and forgets the ids of
+    the variants it replaces.
+    """
+    
+    def __init__(self, maxsize: int = 256):
+        super().__init__()
+        self.maxsize = maxsize
+    
+    def __setitem__(self, project_id, variants):
+        for variant in super().pop(project_id, ()):
+            variant_paths.pop(variant["variant_id"], None)
+        super().__setitem__(project_id, variants)
+        for variant in variants:
+            if variant.get("dxf_url"):
+                variant_paths[variant["variant_id"]] = (variant["dxf_url"], variant["svg_url"])
+        while len(self) > self.maxsize:
+            evicted_id, evicted = self.popitem(last=False)
+            self._remove_files(evicted_id, evicted)
+    
+    def get(self, project_id, default=None):
+        if project_id in self:
+            self.move_to_end(project_id)
+            return self[project_id]
+        return default
+    
+    @staticmethod
+    def _remove_files(project_id: str, variants: List[Dict]) -> None:
+        """Delete an evicted project's files and drop it from the in-memory indexes."""
+        remove_project_files(project_id, variants)
+        logger.info(f"Evicted project {project_id} from variant store")
+
+
+def remove_project_files(project_id: str, variants: List[Dict]) -> None:
+    """
+    Delete a project's directory and drop it from the in-memory indexes.
+    
+    Every removal (eviction, DELETE /project) goes through here, so no
+    variant path or parsed DXF outlives the files it was built from.
+    """
+    for variant in variants:
+        variant_paths.pop(variant["variant_id"], None)
+    for key in [key for key in _DXF_CACHE if key[0] == project_id]:
+        del _DXF_CACHE[key]
+    shutil.rmtree(project_dir(project_id, create=False), ignore_errors=True)
+
+
+generated_variants_store = VariantStore(maxsize=256)
+
+# variant_id -> (dxf_path, svg_path) of generated files
+variant_paths: Dict[str, tuple] = {}
 
 @app.get("/variants/{project_id}")
 def get_generated_variants(project_id: str):
     """Get all generated variants for a project."""
     variants = generated_variants_store.get(project_id, [])
     return {"project_id": project_id, "variants": variants}
+
+
+@app.delete("/project/{project_id}")
+def delete_project(project_id: str):
+    """Delete a project's stored variants and all of its files."""
+    try:
+        proj_dir = project_dir(project_id, create=False)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    variants = generated_variants_store.pop(project_id, [])
+    remove_project_files(project_id, variants)
+    
+    logger.info(f"Deleted project {project_id} ({len(variants)} variants) from {proj_dir}")
+    return {"project_id": project_id, "deleted_variants": len(variants)}
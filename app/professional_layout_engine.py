@@ -18,8 +18,11 @@ Architectural Standards Applied:
 
 from shapely.geometry import Polygon, Point, LineString, box, MultiPolygon
 from shapely.ops import unary_union, split
-from typing import List, Dict, Tuple, Optional
+from shapely.strtree import STRtree
+from typing import List, Dict, Tuple, Optional, Set
+import math
 import numpy as np
+import shapely
 import logging
 
 # Import corridor pattern generator V2.2
@@ -43,6 +46,143 @@ except (ImportError, ValueError):
 logger = logging.getLogger(__name__)
 
 
+def _chunked_union(geoms: List[Polygon], min_chunked: int = 16):
+    """
+    Union of a list of geometries, merged in chunks of about sqrt(n).
+    
+    GEOS union cost grows faster than the input size, so for long lists the
+    chunks are unioned first and then the partial results; short lists are
+    unioned directly.
+    """
+    if len(geoms) < min_chunked:
+        return unary_union(geoms)
+    chunk_size = math.isqrt(len(geoms))
+    return unary_union([
+        unary_union(geoms[i:i + chunk_size]) for i in range(0, len(geoms), chunk_size)
+    ])
+
+
+def _score_candidates(areas: np.ndarray,
+                      target_area: float,
+                      perimeter_lengths: np.ndarray,
+                      corridor_distances: np.ndarray,
+                      has_contact: np.ndarray,
+                      max_corridor_distance: float) -> np.ndarray:
+    """
+    Placement scores of clipped unit candidates.
+    
+    Args:
+        areas: Clipped unit areas (all > 0)
+        target_area: Target unit area in m²
+        perimeter_lengths: Length of each unit's facade on the building perimeter
+        corridor_distances: Distance of each unit to the corridor network
+        has_contact: Whether each unit touches a corridor
+        max_corridor_distance: Corridor distance at which the corridor score reaches 0
+    
+    Returns:
+        Array of scores (max possible is ~17)
+    """
+    area_match = np.minimum(areas / target_area, target_area / areas)
+    perimeter_score = np.minimum(perimeter_lengths / 3.0, 1.0)
+    corridor_score = np.maximum(0, 1.0 - corridor_distances / max_corridor_distance)
+    contact_bonus = np.where(has_contact, 2.0, 0.0)  # Bonus for touching corridor
+    
+    # Weighted score (contact is CRITICAL)
+    return area_match * 8 + perimeter_score * 3 + corridor_score * 4 + contact_bonus
+
+
+def _flat_grid(x_positions: np.ndarray, y_positions: np.ndarray, limit: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Flat x-major coordinate arrays of a grid, cut to the first limit positions."""
+    grid_x, grid_y = np.meshgrid(x_positions, y_positions, indexing='ij')
+    return grid_x.ravel()[:limit], grid_y.ravel()[:limit]
+
+
+def _box_distances(x0: np.ndarray,
+                   y0: np.ndarray,
+                   x1: np.ndarray,
+                   y1: np.ndarray,
+                   piece_bounds: np.ndarray) -> np.ndarray:
+    """
+    Distance from each box to the nearest of a set of axis-aligned boxes.
+    
+    Args:
+        x0, y0, x1, y1: Box coordinates
+        piece_bounds: (C, 4) bounds of the boxes to measure against
+    
+    Returns:
+        Array of minimum distances, one per box
+    """
+    gap_x = np.maximum(0, np.maximum(piece_bounds[:, 0] - x1[:, None], x0[:, None] - piece_bounds[:, 2]))
+    gap_y = np.maximum(0, np.maximum(piece_bounds[:, 1] - y1[:, None], y0[:, None] - piece_bounds[:, 3]))
+    # Compare squared gaps; only the nearest one per box needs the root
+    return np.sqrt((gap_x * gap_x + gap_y * gap_y).min(axis=1))
+
+
+def _viable_candidates(x0: np.ndarray,
+                       y0: np.ndarray,
+                       x1: np.ndarray,
+                       y1: np.ndarray,
+                       region_bounds: np.ndarray,
+                       target_area: float,
+                       min_area_match: float,
+                       corridor_piece_bounds: np.ndarray,
+                       max_corridor_distance: float,
+                       perimeter_bounds: Optional[Tuple[float, float, float, float]],
+                       min_perimeter: float,
+                       best_score: float) -> np.ndarray:
+    """
+    Bounding-box stage of candidate evaluation, in pure NumPy.
+    
+    A unit clipped from a candidate box lies inside the box clipped to its
+    region's bounding box, which bounds its area from above and its corridor
+    distance from below (via the corridor pieces' bounding boxes). From these
+    an upper bound of the placement score follows; candidates that fail a
+    check on the bounds, or whose score bound does not beat best_score, can
+    never be picked.
+    
+    Args:
+        x0, y0, x1, y1: Candidate box coordinates
+        region_bounds: (minx, miny, maxx, maxy) of the region being filled
+        target_area: Target unit area in m²
+        min_area_match: Minimum unit area as a fraction of target_area
+        corridor_piece_bounds: (C, 4) bounds of the corridor pieces
+        max_corridor_distance: Maximum allowed corridor distance
+        perimeter_bounds: Boundary bounds if the boundary is an axis-aligned
+            rectangle, else None
+        min_perimeter: Minimum facade length on the building perimeter
+        best_score: Score of the best placement found so far
+    
+    Returns:
+        Boolean mask of the candidates worth evaluating with GEOS
+    """
+    reg_minx, reg_miny, reg_maxx, reg_maxy = region_bounds
+    cx0, cy0 = np.maximum(x0, reg_minx), np.maximum(y0, reg_miny)
+    cx1, cy1 = np.minimum(x1, reg_maxx), np.minimum(y1, reg_maxy)
+    max_areas = np.maximum(0, cx1 - cx0) * np.maximum(0, cy1 - cy0)
+    
+    min_distances = _box_distances(cx0, cy0, cx1, cy1, corridor_piece_bounds)
+    
+    viable = (max_areas >= target_area * min_area_match) & (min_distances <= max_corridor_distance)
+    
+    perimeter_scores = np.ones_like(max_areas)
+    if perimeter_bounds is not None:
+        eps = 1e-6
+        bminx, bminy, bmaxx, bmaxy = perimeter_bounds
+        on_perimeter = (cx0 <= bminx + eps) | (cy0 <= bminy + eps) | (cx1 >= bmaxx - eps) | (cy1 >= bmaxy - eps)
+        perimeter_scores[~on_perimeter] = 0.0
+        if min_perimeter > 0:
+            viable &= on_perimeter
+    
+    # Same weights as _score_candidates, on the best case of every term
+    score_bounds = (
+        np.minimum(max_areas / target_area, 1.0) * 8
+        + perimeter_scores * 3
+        + np.maximum(0, 1.0 - min_distances / max_corridor_distance) * 4
+        + np.where(min_distances <= 0.05, 2.0, 0.0)
+    )
+    return viable & (score_bounds > best_score)
+
+
 class ProfessionalLayoutEngine:
     """
     Professional architectural layout engine.
@@ -54,11 +194,25 @@ class ProfessionalLayoutEngine:
         self.obstacles = obstacles or []
         self.usable_area = self._calculate_usable_area()
         
+        # Prepare in place so contains/intersects against the boundary and
+        # usable area (core placement, corridor clipping) use GEOS's index
+        shapely.prepare(self.boundary)
+        shapely.prepare(self.usable_area)
+        
         # Get boundary dimensions
-        minx, miny, maxx, maxy = boundary.bounds
+        self.bounds = boundary.bounds
+        minx, miny, maxx, maxy = self.bounds
         self.width = maxx - minx
         self.height = maxy - miny
         self.area = boundary.area
+        self._boundary_edge = boundary.boundary
+        shapely.prepare(self._boundary_edge)
+        
+        # A boundary that fills its bounding box is an axis-aligned rectangle,
+        # however many (repeated or collinear) vertices its ring has; with no
+        # obstacles the usable area is then just the bounding box as well
+        self._rect_boundary = bool(np.isclose(self.area, self.width * self.height, rtol=1e-9))
+        self._is_rect = self._rect_boundary and not self.obstacles
         
         logger.info(f"Professional Layout Engine initialized: {self.width:.1f}m × {self.height:.1f}m = {self.area:.1f}m²")
     
@@ -66,7 +220,7 @@ class ProfessionalLayoutEngine:
         """Calculate usable area by subtracting obstacles."""
         try:
             if self.obstacles:
-                obstacles_union = unary_union(self.obstacles)
+                obstacles_union = _chunked_union(self.obstacles)
                 usable = self.boundary.difference(obstacles_union)
             else:
                 usable = self.boundary
@@ -98,8 +252,7 @@ class ProfessionalLayoutEngine:
         cores = []
         
         centroid = self.boundary.centroid
-        bounds = self.boundary.bounds
-        minx, miny, maxx, maxy = bounds
+        minx, miny, maxx, maxy = self.bounds
         width = maxx - minx
         height = maxy - miny
         
@@ -175,7 +328,7 @@ class ProfessionalLayoutEngine:
         """
         try:
             # Calculate core dimensions (square-ish)
-            core_width = np.sqrt(core_area * 0.9)
+            core_width = math.sqrt(core_area * 0.9)
             core_depth = core_area / core_width
             
             # Create core box
@@ -188,6 +341,8 @@ class ProfessionalLayoutEngine:
             
             # Ensure within usable area
             if not self.usable_area.contains(core):
+                if not self.usable_area.intersects(core):
+                    return None
                 core = core.intersection(self.usable_area)
             
             return core if core.area > core_area * 0.5 else None
@@ -207,13 +362,12 @@ class ProfessionalLayoutEngine:
         """
         try:
             centroid = self.boundary.centroid
-            bounds = self.boundary.bounds
-            minx, miny, maxx, maxy = bounds
+            minx, miny, maxx, maxy = self.bounds
             width = maxx - minx
             height = maxy - miny
             
             # Calculate core dimensions (square-ish)
-            core_width = np.sqrt(core_area * 0.9)
+            core_width = math.sqrt(core_area * 0.9)
             core_depth = core_area / core_width
             
             # Adjust position based on preference
@@ -304,119 +458,23 @@ class ProfessionalLayoutEngine:
         except Exception as e:
             logger.error(f"Failed to create corridor network: {e}")
             return []
-            
-            bounds = self.boundary.bounds
-            minx, miny, maxx, maxy = bounds
-            core_centroid = core.centroid
-            width = maxx - minx
-            height = maxy - miny
-            
-            corridors = []
-            
-            # Strategy: ONE main corridor spine (horizontal or vertical based on building shape)
-            # + Minimal connecting branches to reach all zones
-            
-            if width >= height:
-                # Wider building: use horizontal spine
-                logger.info(f"Building is wider ({width:.1f}m × {height:.1f}m) - using horizontal spine")
-                
-                # Main horizontal spine through core
-                main_corridor = box(
-                    minx,
-                    core_centroid.y - corridor_width / 2,
-                    maxx,
-                    core_centroid.y + corridor_width / 2
-                )
-                main_corridor = main_corridor.intersection(self.usable_area)
-                if not main_corridor.is_empty:
-                    corridors.append(main_corridor)
-                
-                # Extended vertical branches to reach top/bottom zones (80% of height)
-                branch_length = height * 0.8
-                
-                # North branch (extended to reach top units)
-                if height > corridor_width * 3:  # Only if building is tall enough
-                    north_branch = box(
-                        core_centroid.x - corridor_width / 2,
-                        core_centroid.y + corridor_width / 2,
-                        core_centroid.x + corridor_width / 2,
-                        min(maxy - corridor_width, core_centroid.y + branch_length)
-                    )
-                    north_branch = north_branch.intersection(self.usable_area)
-                    if not north_branch.is_empty and north_branch.area > corridor_width * 2:
-                        corridors.append(north_branch)
-                
-                # South branch (extended to reach bottom units)
-                if height > corridor_width * 3:
-                    south_branch = box(
-                        core_centroid.x - corridor_width / 2,
-                        max(miny + corridor_width, core_centroid.y - branch_length),
-                        core_centroid.x + corridor_width / 2,
-                        core_centroid.y - corridor_width / 2
-                    )
-                    south_branch = south_branch.intersection(self.usable_area)
-                    if not south_branch.is_empty and south_branch.area > corridor_width * 2:
-                        corridors.append(south_branch)
-            
-            else:
-                # Taller building: use vertical spine
-                logger.info(f"Building is taller ({width:.1f}m × {height:.1f}m) - using vertical spine")
-                
-                # Main vertical spine through core
-                main_corridor = box(
-                    core_centroid.x - corridor_width / 2,
-                    miny,
-                    core_centroid.x + corridor_width / 2,
-                    maxy
-                )
-                main_corridor = main_corridor.intersection(self.usable_area)
-                if not main_corridor.is_empty:
-                    corridors.append(main_corridor)
-                
-                # Extended horizontal branches to reach left/right zones (80% of width)
-                branch_length = width * 0.8
-                
-                # East branch (extended to reach right units)
-                if width > corridor_width * 3:
-                    east_branch = box(
-                        core_centroid.x + corridor_width / 2,
-                        core_centroid.y - corridor_width / 2,
-                        min(maxx - corridor_width, core_centroid.x + branch_length),
-                        core_centroid.y + corridor_width / 2
-                    )
-                    east_branch = east_branch.intersection(self.usable_area)
-                    if not east_branch.is_empty and east_branch.area > corridor_width * 2:
-                        corridors.append(east_branch)
-                
-                # West branch (extended to reach left units)
-                if width > corridor_width * 3:
-                    west_branch = box(
-                        max(minx + corridor_width, core_centroid.x - branch_length),
-                        core_centroid.y - corridor_width / 2,
-                        core_centroid.x - corridor_width / 2,
-                        core_centroid.y + corridor_width / 2
-                    )
-                    west_branch = west_branch.intersection(self.usable_area)
-                    if not west_branch.is_empty and west_branch.area > corridor_width * 2:
-                        corridors.append(west_branch)
-            
-            # Calculate total corridor area
-            total_corridor_area = sum(c.area for c in corridors)
-            corridor_ratio = total_corridor_area / self.area if self.area > 0 else 0
-            
-            logger.info(f"Created EFFICIENT corridor network:")
-            logger.info(f"  Total corridor area: {total_corridor_area:.2f} m²")
-            logger.info(f"  Corridor ratio: {corridor_ratio*100:.1f}% (target 8-12%)")
-            logger.info(f"  Segments: {len(corridors)}")
-            logger.info(f"  Width: {corridor_width:.2f} m")
-            
-            return corridors
-            
-        except Exception as e:
-            logger.error(f"Failed to create corridor network: {e}")
-            import traceback
-            traceback.print_exc()
-            return []
+    
+    def _clip_to_usable_area(self, minx: float, miny: float, maxx: float, maxy: float) -> Polygon:
+        """
+        Box clipped to the usable area.
+        
+        On a rectangular boundary without obstacles the clip is a plain
+        coordinate clamp; otherwise it is a GEOS intersection.
+        """
+        if not self._is_rect:
+            return box(minx, miny, maxx, maxy).intersection(self.usable_area)
+        
+        bminx, bminy, bmaxx, bmaxy = self.bounds
+        minx, maxx = np.clip([minx, maxx], bminx, bmaxx)
+        miny, maxy = np.clip([miny, maxy], bminy, bmaxy)
+        if minx >= maxx or miny >= maxy:
+            return Polygon()
+        return box(minx, miny, maxx, maxy)
     
     def _create_fallback_T_pattern_corridors(self, core: Polygon, corridor_width: float) -> List[Polygon]:
         """
@@ -425,8 +483,7 @@ class ProfessionalLayoutEngine:
         """
         try:
             w = max(min(corridor_width, 2.5), 2.2)
-            bounds = self.boundary.bounds
-            minx, miny, maxx, maxy = bounds
+            minx, miny, maxx, maxy = self.bounds
             core_center = core.centroid
             width = maxx - minx
             height = maxy - miny
@@ -435,38 +492,34 @@ class ProfessionalLayoutEngine:
             
             if width >= height:
                 # Horizontal main spine
-                main = box(minx, core_center.y - w/2, maxx, core_center.y + w/2)
-                main = main.intersection(self.usable_area)
+                main = self._clip_to_usable_area(minx, core_center.y - w/2, maxx, core_center.y + w/2)
                 if not main.is_empty:
                     corridors.append(main)
                 
                 # Vertical branch (80% of height)
                 branch_len = height * 0.8 / 2
-                branch = box(
+                branch = self._clip_to_usable_area(
                     core_center.x - w/2,
                     core_center.y - branch_len,
                     core_center.x + w/2,
                     core_center.y + branch_len
                 )
-                branch = branch.intersection(self.usable_area)
                 if not branch.is_empty:
                     corridors.append(branch)
             else:
                 # Vertical main spine
-                main = box(core_center.x - w/2, miny, core_center.x + w/2, maxy)
-                main = main.intersection(self.usable_area)
+                main = self._clip_to_usable_area(core_center.x - w/2, miny, core_center.x + w/2, maxy)
                 if not main.is_empty:
                     corridors.append(main)
                 
                 # Horizontal branch (80% of width)
                 branch_len = width * 0.8 / 2
-                branch = box(
+                branch = self._clip_to_usable_area(
                     core_center.x - branch_len,
                     core_center.y - w/2,
                     core_center.x + branch_len,
                     core_center.y + w/2
                 )
-                branch = branch.intersection(self.usable_area)
                 if not branch.is_empty:
                     corridors.append(branch)
             
@@ -480,42 +533,340 @@ class ProfessionalLayoutEngine:
             logger.error(f"Fallback corridor generation failed: {e}")
             return []
     
+    def _corridor_geometry(self, corridors: List[Polygon]) -> Dict:
+        """
+        Corridor geometry shared by the placement passes of one layout.
+        
+        Connected corridors merge into a single polygon in their union, so the
+        per-piece bounds are taken from the individual corridors: the distance
+        to the union is the minimum distance to any of them.
+        
+        Args:
+            corridors: List of corridor polygons
+        
+        Returns:
+            Dict with the union of the corridors ("union"), the prepared 5cm
+            contact buffer ("contact_zone"), the prepared 10cm facing buffer
+            ("facing_zone"), the bounds array of the corridors ("piece_bounds"),
+            whether every corridor is an axis-aligned rectangle ("rect_pieces") and the prepared reach buffers per
+            max_corridor_distance ("reach_zones", filled by _corridor_reach_zone)
+        """
+        corridor_array = np.array(corridors, dtype=object)
+        corridor_array = corridor_array[~shapely.is_empty(corridor_array)]
+        corridor_union = _chunked_union(corridor_array.tolist())
+        
+        contact_zone = corridor_union.buffer(0.05)
+        facing_zone = corridor_union.buffer(0.1)
+        shapely.prepare([contact_zone, facing_zone])
+        piece_bounds = shapely.bounds(corridor_array).reshape(-1, 4)
+        piece_box_areas = (piece_bounds[:, 2] - piece_bounds[:, 0]) * (piece_bounds[:, 3] - piece_bounds[:, 1])
+        return {
+            "union": corridor_union,
+            "contact_zone": contact_zone,
+            "facing_zone": facing_zone,
+            "piece_bounds": piece_bounds,
+            "rect_pieces": bool(corridor_array.size) and bool(
+                np.isclose(shapely.area(corridor_array), piece_box_areas, rtol=1e-9).all()
+            ),
+            "reach_zones": {}
+        }
+    
+    def _corridor_reach_zone(self, corridor_geometry: Dict, max_corridor_distance: float) -> Polygon:
+        """
+        Prepared buffer of the corridors covering every point within max_corridor_distance.
+        
+        The buffer is 1% wider than the distance because its arcs are inscribed
+        polygons; units intersecting it still need the exact distance check.
+        """
+        reach_zones = corridor_geometry["reach_zones"]
+        if max_corridor_distance not in reach_zones:
+            reach_zone = corridor_geometry["union"].buffer(max_corridor_distance * 1.01)
+            shapely.prepare(reach_zone)
+            reach_zones[max_corridor_distance] = reach_zone
+        return reach_zones[max_corridor_distance]
+    
+    def _evaluate_candidates(self,
+                             x0: np.ndarray,
+                             y0: np.ndarray,
+                             unit_width: float,
+                             unit_depth: float,
+                             region: Polygon,
+                             region_bounds: np.ndarray,
+                             region_is_rect: bool,
+                             target_area: float,
+                             corridor_geometry: Dict,
+                             pass_config: Dict,
+                             best_score: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Clip, check and score the unit boxes anchored at (x0, y0) in a region.
+        
+        Args:
+            x0, y0: Lower-left corners of the candidate boxes, in scan order
+            unit_width, unit_depth: Candidate box size
+            region: Region the units are clipped to (prepared unless rectangular)
+            region_bounds: Bounds of the region
+            region_is_rect: Whether the region is an axis-aligned rectangle
+            target_area: Target unit area in m²
+            corridor_geometry: Corridor geometry from _corridor_geometry
+            pass_config: Placement pass configuration
+            best_score: Score to beat; candidates that provably cannot are skipped
+        
+        Returns:
+            Tuple of (clipped units, scores) of the candidates that pass every
+            check, in scan order
+        """
+        no_candidates = (np.empty(0, dtype=object), np.empty(0))
+        max_corridor_distance = pass_config["max_corridor_distance"]
+        corridor_union = corridor_geometry["union"]
+        corridor_contact_zone = corridor_geometry["contact_zone"]
+        corridor_facing_zone = corridor_geometry["facing_zone"]
+        
+        # NEW V2.2: Check corridor-facing width (minimum 2.5m for proper entrance)
+        min_facing_width = pass_config.get("min_corridor_facing_width", 2.5)
+        
+        x1 = x0 + unit_width
+        y1 = y0 + unit_depth
+        
+        # Bounding-box stage: drop candidates that cannot pass the checks
+        # or beat the best placement so far, before any GEOS call. On an
+        # axis-aligned rectangular boundary, a unit can only reach the
+        # perimeter if its box reaches the boundary's bounding box
+        near = _viable_candidates(
+            x0, y0, x1, y1, region_bounds, target_area,
+            pass_config["min_area_match"], corridor_geometry["piece_bounds"], max_corridor_distance,
+            self.bounds if self._rect_boundary else None, pass_config["min_perimeter"], best_score
+        )
+        
+        # Create and clip all remaining unit boxes in one GEOS call each
+        x0, y0, x1, y1 = x0[near], y0[near], x1[near], y1[near]
+        if region_is_rect:
+            # A rectangular region clips a box to its own bounds: clamp the
+            # corners in NumPy instead of running a GEOS intersection
+            reg_minx, reg_miny, reg_maxx, reg_maxy = region_bounds
+            clipped_units = shapely.box(
+                np.clip(x0, reg_minx, reg_maxx), np.clip(y0, reg_miny, reg_maxy),
+                np.clip(x1, reg_minx, reg_maxx), np.clip(y1, reg_miny, reg_maxy)
+            )
+        else:
+            # Boxes the region contains are their own clip: one prepared
+            # containment test for the batch, and only the others need the
+            # GEOS intersection
+            clipped_units = shapely.box(x0, y0, x1, y1)
+            outside = ~shapely.contains(region, clipped_units)
+            clipped_units[outside] = shapely.intersection(clipped_units[outside], region)
+        
+        # Checks run cheapest first, each on the survivors of the previous one
+        
+        # ✅ V2.4.1: CRITICAL FIX - Only non-empty Polygons can be units
+        # Check minimum area
+        areas = shapely.area(clipped_units)
+        keep = (
+            ~shapely.is_empty(clipped_units)
+            & (shapely.get_type_id(clipped_units) == shapely.GeometryType.POLYGON)
+            & (areas >= target_area * pass_config["min_area_match"])
+        )
+        candidates, areas = clipped_units[keep], areas[keep]
+        
+        # Apply corridor distance requirement from config: a prepared intersects
+        # test against the reach buffer rejects far units, and only the rest
+        # get the exact distance (which the score needs)
+        keep = shapely.intersects(candidates, self._corridor_reach_zone(corridor_geometry, max_corridor_distance))
+        candidates, areas = candidates[keep], areas[keep]
+        
+        # Between rectangular units and rectangular corridors the nearest
+        # box-to-box distance is exact; other units need GEOS
+        is_box = np.zeros(len(candidates), dtype=bool)
+        if corridor_geometry["rect_pieces"]:
+            cand_bounds = shapely.bounds(candidates).reshape(-1, 4)
+            is_box = np.isclose(
+                areas, (cand_bounds[:, 2] - cand_bounds[:, 0]) * (cand_bounds[:, 3] - cand_bounds[:, 1]), rtol=1e-9
+            )
+        corridor_distances = np.empty(len(candidates))
+        if is_box.any():
+            corridor_distances[is_box] = _box_distances(*cand_bounds[is_box].T, corridor_geometry["piece_bounds"])
+        corridor_distances[~is_box] = shapely.distance(candidates[~is_box], corridor_union)
+        keep = corridor_distances <= max_corridor_distance
+        candidates, areas, corridor_distances = candidates[keep], areas[keep], corridor_distances[keep]
+        if not candidates.size:
+            return no_candidates
+        
+        try:
+            # Apply perimeter requirement from config; edges that miss the
+            # (prepared) boundary have no facade, only the rest are intersected
+            unit_edges = shapely.boundary(candidates)
+            perimeter_lengths = np.zeros(len(candidates))
+            on_edge = shapely.intersects(self._boundary_edge, unit_edges)
+            perimeter_lengths[on_edge] = shapely.length(shapely.intersection(unit_edges[on_edge], self._boundary_edge))
+            keep = perimeter_lengths >= pass_config["min_perimeter"]
+            
+            # Skip if facing width too narrow (can't fit door properly)
+            facing_widths = np.zeros(len(candidates))
+            facing = keep.copy()
+            facing[keep] = shapely.intersects(corridor_facing_zone, unit_edges[keep])
+            facing_widths[facing] = shapely.length(shapely.intersection(unit_edges[facing], corridor_facing_zone))
+            keep &= ~((facing_widths > 0) & (facing_widths < min_facing_width))
+            
+            candidates, areas, corridor_distances = candidates[keep], areas[keep], corridor_distances[keep]
+            perimeter_lengths = perimeter_lengths[keep]
+            
+            # Check if unit TOUCHES corridor (shared edge)
+            contacts = shapely.intersects(candidates, corridor_contact_zone)
+            contacts[contacts] = shapely.area(
+                shapely.intersection(candidates[contacts], corridor_contact_zone)
+            ) < 0.1
+        except Exception as e:
+            logger.debug(f"Candidate checks failed: {e}")
+            return no_candidates
+        
+        scores = _score_candidates(
+            areas, target_area, perimeter_lengths, corridor_distances, contacts, max_corridor_distance
+        )
+        return candidates, scores
+    
+    def _index_regions(self,
+                       available_regions: List[Polygon],
+                       corridor_reach_tree: STRtree,
+                       spec_areas: np.ndarray,
+                       spec_widths: np.ndarray,
+                       spec_depths: np.ndarray) -> Dict:
+        """
+        Region arrays for a placement pass, rebuilt after every placement.
+        
+        Args:
+            available_regions: Free regions, largest first
+            corridor_reach_tree: Tree of the corridor pieces' bounds grown by
+                the pass's max corridor distance
+            spec_areas, spec_widths, spec_depths: Unit size of every spec
+        
+        Returns:
+            Dict with all regions and their bounds, the regions within corridor
+            reach with their bounds, areas and rectangle flags, which of those
+            fit each spec (rows) and whether any region holds each spec
+        """
+        region_array = np.array(available_regions, dtype=object)
+        region_hits, _ = corridor_reach_tree.query(region_array)
+        reach_idx = np.unique(region_hits)
+        
+        # Region bounds and areas as arrays, so the per-unit size checks run
+        # in NumPy instead of one GEOS property call per region
+        region_bounds = shapely.bounds(region_array).reshape(-1, 4)
+        region_areas = shapely.area(region_array)
+        region_widths = region_bounds[:, 2] - region_bounds[:, 0]
+        region_heights = region_bounds[:, 3] - region_bounds[:, 1]
+        # A region that fills its bounding box is an axis-aligned rectangle
+        region_is_rect = np.isclose(region_areas, region_widths * region_heights, rtol=1e-9)
+        
+        # Regions (columns) big enough for each spec (rows) and wide/tall enough
+        # to hold at least one grid position (empty regions have zero area)
+        sized = (
+            (region_areas >= spec_areas[:, None] * 0.3) &
+            (region_widths > spec_widths[:, None] * 0.2) &
+            (region_heights > spec_depths[:, None] * 0.2)
+        )
+        
+        # Prepare the reachable non-rectangular regions for the containment
+        # tests of every spec (rectangular ones are clipped in NumPy)
+        is_rect = region_is_rect[reach_idx]
+        shapely.prepare(region_array[reach_idx][~is_rect])
+        
+        return {
+            "all_regions": region_array,
+            "all_bounds": region_bounds,
+            "regions": region_array[reach_idx],
+            "bounds": region_bounds[reach_idx],
+            "areas": region_areas[reach_idx],
+            "is_rect": is_rect,
+            "fits": sized[:, reach_idx],
+            "held": sized.any(axis=1)
+        }
+    
     def _place_units_pass(self,
                           unit_specs: List[Dict],
                           available_regions: List[Polygon],
-                          corridor_union: Polygon,
+                          corridor_geometry: Dict,
                           placed_units: List[Dict],
-                          pass_config: Dict) -> List[Dict]:
+                          pass_config: Dict,
+                          unsized_specs: Optional[Set[int]] = None) -> Tuple[List[Dict], Set[int]]:
         """
         Single placement pass with specific configuration.
-        Returns remaining unplaced unit specs.
+        
+        unsized_specs holds the ids of the specs an earlier pass of the same
+        layout found no region big enough for; they are skipped.
+        
+        Returns:
+            Tuple of (remaining unplaced unit specs, ids of the specs no region
+            can hold, for the next pass)
         """
         remaining = []
+        unsized_specs = set(unsized_specs) if unsized_specs else set()
         pass_name = pass_config["name"]
         placed_count = 0
+        max_corridor_distance = pass_config["max_corridor_distance"]
         
-        for spec in unit_specs:
-            target_area = spec["target_area"]
-            unit_type = spec["type"]
+        # ✅ V2.5: Track best placement for early exit
+        excellent_threshold = 0.92  # Exit early if placement is excellent
+        
+        buffer_dist = 0.15  # 15cm spacing (wall thickness) - reduced for better density
+        
+        # Only regions whose bounds come within max_corridor_distance of a
+        # corridor's bounds are scanned: no unit clipped from the others can
+        # pass the distance check. Each corridor's reach box is indexed, so a
+        # region beside one corridor arm is not kept by the whole network's bbox
+        piece_bounds = corridor_geometry["piece_bounds"]
+        corridor_reach_tree = STRtree(shapely.box(
+            piece_bounds[:, 0] - max_corridor_distance, piece_bounds[:, 1] - max_corridor_distance,
+            piece_bounds[:, 2] + max_corridor_distance, piece_bounds[:, 3] + max_corridor_distance
+        ))
+        
+        # Unit dimensions of every spec as arrays
+        spec_areas = np.array([spec["target_area"] for spec in unit_specs], dtype=float)
+        spec_widths = np.sqrt(spec_areas * 1.3)
+        spec_depths = spec_areas / spec_widths
+        
+        regions = self._index_regions(available_regions, corridor_reach_tree, spec_areas, spec_widths, spec_depths)
+        
+        # Regions only shrink and the size checks are the same in every pass,
+        # so a spec no region holds now cannot be placed by any later pass
+        unsized_specs.update(id(spec) for spec, held in zip(unit_specs, regions["held"]) if not held)
+        
+        # Free area the pass can still fill, against the smallest area any
+        # remaining spec would accept
+        free_area = regions["areas"].sum()
+        min_remaining_areas = np.minimum.accumulate(spec_areas[::-1])[::-1] * pass_config["min_area_match"]
+        
+        for spec_idx, spec in enumerate(unit_specs):
+            if free_area < min_remaining_areas[spec_idx]:
+                # No spec left can fit what is left of the reachable regions
+                logger.debug(f"  Pass '{pass_name}': {free_area:.1f} m² left, skipping {len(unit_specs) - spec_idx} specs")
+                remaining.extend(unit_specs[spec_idx:])
+                break
+            
+            if id(spec) in unsized_specs:
+                # No region can hold it (in this or an earlier pass)
+                remaining.append(spec)
+                continue
             
-            # Calculate unit dimensions
-            unit_width = np.sqrt(target_area * 1.3)
-            unit_depth = target_area / unit_width
+            target_area = spec_areas[spec_idx]
+            unit_type = spec["type"]
+            unit_width = spec_widths[spec_idx]
+            unit_depth = spec_depths[spec_idx]
             
             best_unit = None
             best_score = -1
             
             # Try each available region
-            for region in available_regions:
-                if region.is_empty or region.area < target_area * 0.3:
-                    continue
+            for region_idx in np.flatnonzero(regions["fits"][spec_idx]):
+                # ✅ V2.5: Stop scanning regions once placement is excellent
+                # Normalized score: max possible is ~17 (8+3+4+2)
+                if best_unit and best_score >= excellent_threshold * 17:
+                    break
                 
-                reg_bounds = region.bounds
-                reg_minx, reg_miny, reg_maxx, reg_maxy = reg_bounds
+                region = regions["regions"][region_idx]
+                reg_minx, reg_miny, reg_maxx, reg_maxy = regions["bounds"][region_idx]
                 
                 # ✅ V2.5: Adaptive grid sampling - fine for small regions, coarse for large
                 # Quality-first approach: maintain coverage while optimizing speed
-                region_area = region.area
+                region_area = regions["areas"][region_idx]
                 if region_area < 100:  # Small region (< 100 m²)
                     # Fine grid for precision
                     x_step = max(0.3, unit_width * 0.15)
@@ -529,104 +880,27 @@ class ProfessionalLayoutEngine:
                     x_step = max(0.5, unit_width * 0.25)
                     y_step = max(0.5, unit_depth * 0.25)
                 
-                x_positions = np.arange(reg_minx, reg_maxx - unit_width * 0.2, x_step)
-                y_positions = np.arange(reg_miny, reg_maxy - unit_depth * 0.2, y_step)
-                
-                max_attempts = pass_config["max_attempts"]
-                attempts = 0
-                
-                # ✅ V2.5: Track best placement for early exit
-                excellent_threshold = 0.92  # Exit early if placement is excellent
+                # Whole candidate grid as flat coordinate arrays, in the same
+                # x-major order as the scan; max_attempts caps grid positions
+                x0, y0 = _flat_grid(
+                    np.arange(reg_minx, reg_maxx - unit_width * 0.2, x_step),
+                    np.arange(reg_miny, reg_maxy - unit_depth * 0.2, y_step),
+                    pass_config["max_attempts"]
+                )
+                candidates, scores = self._evaluate_candidates(
+                    x0, y0, unit_width, unit_depth, region, regions["bounds"][region_idx], regions["is_rect"][region_idx],
+                    target_area, corridor_geometry, pass_config, best_score
+                )
+                if not scores.size:
+                    continue
                 
-                for x in x_positions:
-                    for y in y_positions:
-                        if attempts >= max_attempts:
-                            break
-                        attempts += 1
-                        
-                        # Create unit box
-                        unit_poly = box(x, y, x + unit_width, y + unit_depth)
-                        unit_clipped = unit_poly.intersection(region)
-                        
-                        # ✅ V2.4.1: CRITICAL FIX - Check if unit_clipped is a valid Polygon
-                        if unit_clipped.is_empty or not isinstance(unit_clipped, Polygon):
-                            continue
-                        
-                        # Check minimum area
-                        if unit_clipped.area < target_area * pass_config["min_area_match"]:
-                            continue
-                        
-                        # ✅ V2.4.1: Safe perimeter access check
-                        try:
-                            if unit_clipped.boundary is None:
-                                continue
-                            perimeter_contact = unit_clipped.boundary.intersection(self.boundary.boundary)
-                            perimeter_length = perimeter_contact.length if hasattr(perimeter_contact, 'length') else 0
-                        except Exception as e:
-                            logger.debug(f"Perimeter check failed: {e}")
-                            continue
-                        
-                        # Apply perimeter requirement from config
-                        if perimeter_length < pass_config["min_perimeter"]:
-                            continue
-                        
-                        # Check corridor proximity AND contact
-                        try:
-                            corridor_distance = unit_clipped.distance(corridor_union)
-                            # Check if unit TOUCHES corridor (shared edge)
-                            corridor_contact = unit_clipped.intersection(corridor_union.buffer(0.05))
-                            has_corridor_contact = not corridor_contact.is_empty and corridor_contact.area < 0.1
-                            
-                            # NEW V2.2: Check corridor-facing width (minimum 2.5m for proper entrance)
-                            min_facing_width = pass_config.get("min_corridor_facing_width", 2.5)
-                            
-                            # ✅ V2.4.1: Safe boundary check
-                            if unit_clipped.boundary is None:
-                                facing_width = 0
-                            else:
-                                corridor_facing_edge = unit_clipped.boundary.intersection(corridor_union.buffer(0.1))
-                                
-                                if hasattr(corridor_facing_edge, 'length'):
-                                    facing_width = corridor_facing_edge.length
-                                else:
-                                    facing_width = 0
-                            
-                            # Skip if facing width too narrow (can't fit door properly)
-                            if facing_width > 0 and facing_width < min_facing_width:
-                                continue
-                        except Exception as e:
-                            logger.debug(f"Corridor check failed: {e}")
-                            corridor_distance = 999
-                            has_corridor_contact = False
-                        
-                        # Apply corridor distance requirement from config
-                        if corridor_distance > pass_config["max_corridor_distance"]:
-                            continue
-                        
-                        # Score this placement
-                        area_match = min(unit_clipped.area / target_area, target_area / unit_clipped.area)
-                        perimeter_score = min(perimeter_length / 3.0, 1.0)
-                        corridor_score = max(0, 1.0 - corridor_distance / pass_config["max_corridor_distance"])
-                        contact_bonus = 2.0 if has_corridor_contact else 0  # Bonus for touching corridor
-                        
-                        # Weighted score (contact is CRITICAL)
-                        score = area_match * 8 + perimeter_score * 3 + corridor_score * 4 + contact_bonus
-                        
-                        if score > best_score:
-                            best_unit = unit_clipped
-                            best_score = score
-                            
-                            # ✅ V2.5: Early exit if placement is excellent (saves 20-30% time)
-                            # Normalized score: max possible is ~17 (8+3+4+2)
-                            if best_score >= excellent_threshold * 17:
-                                break  # Good enough, don't waste time on perfection
-                    
-                    # ✅ V2.5: Break outer loop too if excellent placement found
-                    if best_unit and best_score >= excellent_threshold * 17:
-                        break
-                    
-                    if attempts >= max_attempts:
-                        break
+                # ✅ V2.5: Take the first excellent placement in scan order
+                # (good enough, don't waste time on perfection), else the best one
+                excellent = np.flatnonzero(scores >= excellent_threshold * 17)
+                pick = excellent[0] if excellent.size else int(np.argmax(scores))
+                if scores[pick] > best_score:
+                    best_unit = candidates[pick]
+                    best_score = scores[pick]
             
             # Place best unit if found
             if best_unit and best_score > 0:
@@ -637,29 +911,47 @@ class ProfessionalLayoutEngine:
                 })
                 placed_count += 1
                 
-                # ✅ V2.4: Remove from available regions (with proper wall spacing)
-                buffer_dist = 0.15  # 15cm spacing (wall thickness) - reduced for better density
+                # ✅ V2.4: Remove from available regions (with proper wall spacing);
+                # only the regions whose bounds reach the placed zone can change
+                placed_zone = best_unit.buffer(buffer_dist)
+                zone_minx, zone_miny, zone_maxx, zone_maxy = placed_zone.bounds
+                all_bounds = regions["all_bounds"]
+                touched = (
+                    (all_bounds[:, 0] < zone_maxx) & (all_bounds[:, 2] > zone_minx) &
+                    (all_bounds[:, 1] < zone_maxy) & (all_bounds[:, 3] > zone_miny)
+                )
+                remaining_areas = iter(shapely.difference(regions["all_regions"][touched], placed_zone))
                 new_regions = []
-                for region in available_regions:
-                    remaining_area = region.difference(best_unit.buffer(buffer_dist))
+                for region, cut in zip(available_regions, touched):
+                    if not cut:
+                        new_regions.append(region)
+                        continue
+                    remaining_area = next(remaining_areas)
                     if not remaining_area.is_empty:
                         if isinstance(remaining_area, MultiPolygon):
                             new_regions.extend(list(remaining_area.geoms))
                         else:
                             new_regions.append(remaining_area)
-                available_regions[:] = new_regions
-                available_regions.sort(key=lambda p: p.area, reverse=True)
+                # Largest first, from one array of areas instead of a GEOS call per key
+                order = np.argsort(-shapely.area(np.array(new_regions, dtype=object)), kind='stable')
+                available_regions[:] = [new_regions[i] for i in order]
+                
+                regions = self._index_regions(
+                    available_regions, corridor_reach_tree, spec_areas, spec_widths, spec_depths
+                )
+                free_area = regions["areas"].sum()
             else:
                 # Could not place this unit in this pass
                 remaining.append(spec)
         
         logger.info(f"  Pass '{pass_name}': Placed {placed_count} units")
-        return remaining
+        return remaining, unsized_specs
     
     def layout_units_with_corridor_access(self,
                                          core: Polygon,
                                          corridors: List[Polygon],
-                                         unit_constraints: Dict) -> List[Dict]:
+                                         unit_constraints: Dict,
+                                         seed: Optional[int] = None) -> List[Dict]:
         """
         ✅ V3.0: Layout units using ROW-BASED algorithm for 95%+ coverage.
         
@@ -689,8 +981,11 @@ class ProfessionalLayoutEngine:
             "total_units": {"min": 10, "max": 50},
             "distribution_strategy": {...}
         }
+        
+        seed (optional) makes the V2.x random unit areas and region order reproducible.
         """
         units = []
+        rng = np.random.default_rng(seed)
         
         # ✅ V3.0: Check if row-based layout should be used
         use_v3_row_based = unit_constraints.get("use_v3_row_based", True)  # Default: use V3.0!
@@ -704,7 +999,7 @@ class ProfessionalLayoutEngine:
                 from .row_based_layout_v3 import RowBasedLayoutV3
                 
                 # Calculate available area
-                occupied = unary_union([core] + corridors)
+                occupied = _chunked_union([core] + corridors)
                 available = self.usable_area.difference(occupied)
                 
                 if available.is_empty:
@@ -798,14 +1093,15 @@ class ProfessionalLayoutEngine:
                 # Place units
                 placed_units = v3_engine.layout_units_row_based(unit_specs)
                 
-                # Convert format
-                for i, unit_data in enumerate(placed_units, 1):
+                # Convert format (all centroids in one GEOS call)
+                centroids = shapely.centroid(np.array([u["polygon"] for u in placed_units], dtype=object))
+                for i, (unit_data, centroid) in enumerate(zip(placed_units, centroids), 1):
                     units.append({
                         "id": f"unit_{i}",
                         "type": unit_data["type"],
                         "polygon": unit_data["polygon"],
                         "area": unit_data["area"],
-                        "centroid": unit_data["polygon"].centroid
+                        "centroid": centroid
                     })
                 
                 logger.info(f"✅ V3.0: Placed {len(units)} units successfully")
@@ -823,7 +1119,7 @@ class ProfessionalLayoutEngine:
         
         try:
             # Calculate available area (exclude core + corridors)
-            occupied = unary_union([core] + corridors)
+            occupied = _chunked_union([core] + corridors)
             available = self.usable_area.difference(occupied)
             
             if available.is_empty:
@@ -894,8 +1190,7 @@ class ProfessionalLayoutEngine:
                     # Extract dimensions (NEW)
                     dimensions = ut.get("dimensions", {})
                     
-                    for i in range(count):
-                        target_area = np.random.uniform(min_area, max_area)
+                    for target_area in rng.uniform(min_area, max_area, size=count):
                         unit_specs.append({
                             "type": unit_type,
                             "target_area": target_area,
@@ -927,8 +1222,7 @@ class ProfessionalLayoutEngine:
                     
                     dimensions = ut.get("dimensions", {})
                     
-                    for i in range(count):
-                        target_area = np.random.uniform(min_area, max_area)
+                    for target_area in rng.uniform(min_area, max_area, size=count):
                         unit_specs.append({
                             "type": unit_type,
                             "target_area": target_area,
@@ -945,7 +1239,7 @@ class ProfessionalLayoutEngine:
                 logger.warning("No corridors available - cannot place units without corridor access")
                 return []
             
-            corridor_union = unary_union(corridors)
+            corridor_geometry = self._corridor_geometry(corridors)
             
             # Split available area into regions
             if isinstance(available, MultiPolygon):
@@ -953,10 +1247,19 @@ class ProfessionalLayoutEngine:
             else:
                 available_regions = [available]
             
+            # Regions smaller than the smallest unit at the loosest area match
+            # (25%, pass 3) can never hold one: drop them before any pass
+            region_areas = shapely.area(np.array(available_regions, dtype=object))
+            target_areas = np.array([spec["target_area"] for spec in unit_specs])
+            fit = np.flatnonzero(region_areas >= target_areas.min(initial=np.inf) * 0.25)
+            
             # ✅ V2.4: Don't sort by area! This causes all units to cluster in largest region.
-            # Instead, shuffle for balanced distribution across all regions
-            import random
-            random.shuffle(available_regions)  # Random order for balanced distribution
+            # Instead, order randomly for balanced distribution across all regions,
+            # weighting each region by how many average units it can hold
+            if fit.size:
+                quota = np.maximum(1, np.floor(region_areas[fit] / target_areas.mean()))
+                fit = rng.choice(fit, size=fit.size, replace=False, p=quota / quota.sum())
+            available_regions = [available_regions[i] for i in fit]
             
             logger.info(f"Available area has {len(available_regions)} regions")
             
@@ -970,10 +1273,10 @@ class ProfessionalLayoutEngine:
             
             # PASS 1: Strict placement (DIRECT corridor adjacency)
             logger.info("Pass 1: Strict placement (DIRECT corridor access)...")
-            remaining_specs = self._place_units_pass(
+            remaining_specs, unsized_specs = self._place_units_pass(
                 remaining_specs,
                 available_regions,
-                corridor_union,
+                corridor_geometry,
                 placed_units,
                 pass_config={
                     "name": "strict",
@@ -988,10 +1291,10 @@ class ProfessionalLayoutEngine:
             # PASS 2: Relaxed placement (reasonable corridor proximity)
             if remaining_specs:
                 logger.info(f"Pass 2: Relaxed placement ({len(remaining_specs)} remaining)...")
-                remaining_specs = self._place_units_pass(
+                remaining_specs, unsized_specs = self._place_units_pass(
                     remaining_specs,
                     available_regions,
-                    corridor_union,
+                    corridor_geometry,
                     placed_units,
                     pass_config={
                         "name": "relaxed",
@@ -1000,16 +1303,17 @@ class ProfessionalLayoutEngine:
                         "min_corridor_facing_width": 1.0,  # ✅ V2.4.3: Relaxed 2.0m → 1.0m
                         "min_area_match": 0.35,  # ✅ V2.5.1: CRITICAL 50% → 35%
                         "max_attempts": 500  # ✅ V2.4.3: Increased for better coverage
-                    }
+                    },
+                    unsized_specs=unsized_specs
                 )
             
             # PASS 3: Flexible placement (fill remaining space)
             if remaining_specs:
                 logger.info(f"Pass 3: Flexible placement ({len(remaining_specs)} remaining)...")
-                remaining_specs = self._place_units_pass(
+                remaining_specs, unsized_specs = self._place_units_pass(
                     remaining_specs,
                     available_regions,
-                    corridor_union,
+                    corridor_geometry,
                     placed_units,
                     pass_config={
                         "name": "flexible",
@@ -1018,33 +1322,36 @@ class ProfessionalLayoutEngine:
                         "min_corridor_facing_width": 0.0,  # ✅ V2.4.3: No requirement
                         "min_area_match": 0.25,    # ✅ V2.5.1: CRITICAL 40% → 25% (fill ALL space)
                         "max_attempts": 1500  # ✅ V2.5.1: CRITICAL 800 → 1500 (maximum filling)
-                    }
+                    },
+                    unsized_specs=unsized_specs
                 )
             
             if remaining_specs:
                 logger.warning(f"Could not place {len(remaining_specs)} units after 3 passes")
             
-            # Create final units list with proper IDs
-            for i, unit_data in enumerate(placed_units, 1):
+            # Create final units list with proper IDs, counting types and
+            # summing areas in the same pass (all centroids in one GEOS call)
+            units_by_type = {}
+            units_area = 0.0
+            centroids = shapely.centroid(np.array([u["polygon"] for u in placed_units], dtype=object))
+            for i, (unit_data, centroid) in enumerate(zip(placed_units, centroids), 1):
+                ut = unit_data["type"]
                 units.append({
                     "id": f"unit_{i}",
-                    "type": unit_data["type"],
+                    "type": ut,
                     "polygon": unit_data["polygon"],
                     "area": unit_data["area"],
-                    "centroid": unit_data["polygon"].centroid
+                    "centroid": centroid
                 })
+                units_by_type[ut] = units_by_type.get(ut, 0) + 1
+                units_area += unit_data["area"]
             
             logger.info(f"Placed {len(units)}/{len(unit_specs)} units ({len(units)/len(unit_specs)*100:.1f}%)")
             
             # Log by type
-            units_by_type = {}
-            for unit in units:
-                ut = unit["type"]
-                units_by_type[ut] = units_by_type.get(ut, 0) + 1
             logger.info(f"Units by type: {units_by_type}")
             
             # Calculate metrics
-            units_area = sum(u["area"] for u in units)
             corridor_area = sum(c.area for c in corridors)
             efficiency = units_area / self.area if self.area > 0 else 0
             corridor_ratio = corridor_area / self.area if self.area > 0 else 0
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Seeded before/after check of the candidate search shortcuts
+
+1. Bounding-box pruning (_viable_candidates) vs evaluating every candidate,
+   on the same seeded layouts
+2. Units placed per seed vs the counts of the original placement pass, which
+   re-split every region after each placement and scanned each candidate
+   one by one
+"""
+import os
+import sys
+import time
+import logging
+import numpy as np
+import shapely
+from shapely.geometry import Polygon, box
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app.professional_layout_engine as engine_module
+from app.professional_layout_engine import ProfessionalLayoutEngine
+
+logging.basicConfig(level=logging.WARNING)
+
+SEED = 7
+BOUNDARIES = {
+    "rectangle 60×40": box(0, 0, 60, 40),
+    "L-shape": Polygon([(0, 0), (70.4, 0), (70.4, 10), (60, 10), (60, 50.4),
+                        (10, 50.4), (10, 40), (0, 40)]),
+}
+PATTERNS = ["T", "L", "H", "grid"]
+UNIT_CONFIG = {
+    "generation_strategy": "fill_available",
+    "use_v3_row_based": False,
+    "units": [
+        {"type": "Studio", "percentage": 30, "priority": 2, "area": {"min": 25, "max": 35}},
+        {"type": "1BR", "percentage": 40, "priority": 1, "area": {"min": 45, "max": 65}},
+        {"type": "2BR", "percentage": 30, "priority": 1, "area": {"min": 65, "max": 85}}
+    ],
+    "total_units": {"min": 10, "max": 60}
+}
+# Units placed on seeds 0-7 by the original placement pass
+EXPECTED_COUNTS = {
+    ("rectangle 60×40", "T"): [34] * 8,
+    ("rectangle 60×40", "L"): [34] * 8,
+    ("rectangle 60×40", "H"): [34] * 8,
+    ("rectangle 60×40", "grid"): [30] * 8,
+    ("L-shape", "T"): [44] * 8,
+    ("L-shape", "L"): [46, 46, 42, 46, 44, 46, 45, 46],
+    ("L-shape", "H"): [43] * 8,
+    ("L-shape", "grid"): [40] * 8,
+}
+
+
+def run_layout(boundary, pattern, seed=SEED):
+    """Run one seeded layout, returns (units, seconds)"""
+    engine = ProfessionalLayoutEngine(boundary)
+    core = engine.place_core(40.0)
+    corridors = engine.create_visible_corridor_network(core, corridor_width=1.8, pattern=pattern)
+    start = time.perf_counter()
+    units = engine.layout_units_with_corridor_access(core, corridors, UNIT_CONFIG, seed=seed)
+    return units, time.perf_counter() - start
+
+
+def same_layout(units_a, units_b):
+    """Same units, in the same order, with the same geometry"""
+    if len(units_a) != len(units_b):
+        return False
+    return all(
+        a["type"] == b["type"] and shapely.equals_exact(a["polygon"], b["polygon"], 1e-6)
+        for a, b in zip(units_a, units_b)
+    )
+
+
+def total_area(units):
+    return sum(u["area"] for u in units)
+
+
+def check_pruning():
+    """Pruned search must place exactly what the unpruned search places"""
+    print("\n1️⃣ Bounding-box pruning vs evaluating every candidate")
+    viable_candidates = engine_module._viable_candidates
+    failures = 0
+    for name, boundary in BOUNDARIES.items():
+        for pattern in PATTERNS:
+            pruned, pruned_time = run_layout(boundary, pattern)
+            engine_module._viable_candidates = lambda x0, *args, **kwargs: np.ones(len(x0), dtype=bool)
+            try:
+                full, full_time = run_layout(boundary, pattern)
+            finally:
+                engine_module._viable_candidates = viable_candidates
+            ok = same_layout(pruned, full)
+            failures += not ok
+            print(f"   {'✅' if ok else '❌'} {name:16s} {pattern:5s} "
+                  f"{len(pruned):3d} units {total_area(pruned):7.1f} m² ({pruned_time:.2f}s) | "
+                  f"unpruned {len(full):3d} units {total_area(full):7.1f} m² ({full_time:.2f}s)")
+    return failures
+
+
+def check_unit_counts():
+    """Seeded unit counts must match the per-placement region split"""
+    print("\n2️⃣ Unit counts vs the per-placement region split, seeds 0-7")
+    failures = 0
+    for (name, pattern), expected in EXPECTED_COUNTS.items():
+        counts = [len(run_layout(BOUNDARIES[name], pattern, seed)[0]) for seed in range(8)]
+        ok = counts == expected
+        failures += not ok
+        print(f"   {'✅' if ok else '❌'} {name:16s} {pattern:5s} {counts} (expected {expected})")
+    return failures
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("CANDIDATE SEARCH SHORTCUTS - SEEDED BEFORE/AFTER")
+    print("=" * 70)
+
+    pruning_failures = check_pruning()
+    count_failures = check_unit_counts()
+
+    print("\n" + "=" * 70)
+    assert pruning_failures == 0, f"{pruning_failures} layouts changed without pruning"
+    assert count_failures == 0, f"{count_failures} boundary/pattern pairs place a different number of units"
+    print("✅ Pruning is exact and unit counts match the original placement pass")
+    print("=" * 70)